@@ -0,0 +1,32 @@
+"""
+Answering bots.
+
+The bot modules pull in the model stack (torch, sentence-transformers, FAISS)
+when imported, so the entry points are resolved lazily (PEP 562): importing
+the package is cheap and each bot module is loaded on first attribute access.
+"""
+
+import importlib
+
+# public name -> submodule that defines it
+_LAZY_ATTRS = {
+    "bot2_answer": ".bot2_semantic",
+    "bot3_answer": ".bot3_rag",
+    "get_rule_response": ".rule_bot",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache so later lookups skip __getattr__ entirely
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -10,6 +10,7 @@ from config.settings import settings
 from core.audit_logger import get_audit_logger
 from core.logger import get_logger
 from core.model_manager import ModelManager
+from core.vector_search import search_l2
 
 logger = get_logger("bot2")
 audit_logger = get_audit_logger("bot2")
@@ -76,7 +77,7 @@ def bot2_answer(query: str, query_id: str = "unknown", category: Optional[str] =
         top_k = settings.TOP_K_BOT2 * 3 # Retrieve more to allow for filtering
         
         # SEARCH THE INDEX
-        distances, indices = index.search(query_embedding, top_k)
+        distances, indices = search_l2(index, query_embedding, top_k)
         
         valid_hits = []
         
@@ -182,7 +183,7 @@ def bot2_answer(query: str, query_id: str = "unknown", category: Optional[str] =
                     # Since we are inside the function, we can't easily reuse the code above without refactoring
                     # So we will do a quick search
                     
-                    D, I = idx.search(query_embedding, 1) # Top 1 only for speed
+                    D, I = search_l2(idx, query_embedding, 1) # Top 1 only for speed
                     
                     if len(D) > 0 and len(I) > 0:
                         dist = D[0][0]
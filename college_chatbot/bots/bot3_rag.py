@@ -26,6 +26,7 @@ import numpy as np
 from config.settings import settings
 from core.audit_logger import get_audit_logger
 from core.logger import get_logger
+from core.vector_search import search_l2
 from sentence_transformers import SentenceTransformer
 from bots.hybrid_retriever import hybrid_retriever
 from services.response_formatter import render_response, extract_json_from_text
@@ -269,7 +270,7 @@ def retrieve_context(
         
         # Search FAISS index
         print(f"[DEBUG] Searching FAISS with top_k={top_k}...")
-        distances, indices = faiss_index.search(query_embedding, top_k)
+        distances, indices = search_l2(faiss_index, query_embedding, top_k)
         print(f"[DEBUG] Search results - Indices: {indices}, Distances: {distances}")
         distances = distances[0]
         indices = indices[0]
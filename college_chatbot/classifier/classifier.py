@@ -1,11 +1,32 @@
-from typing import Dict, Tuple
+import threading
+import weakref
+from typing import Dict, List, Tuple
 import numpy as np
+from cachetools import LRUCache
 from core.model_manager import ModelManager
 
+# classifier instance -> LRU of normalized query -> prediction. Weak keys, so
+# a reloaded model starts with an empty cache and the old model (and its
+# entries) can be freed.
+_PREDICTION_CACHES = weakref.WeakKeyDictionary()
+_CACHE_LOCK = threading.Lock()
+
+def _normalize_query(query: str) -> str:
+    """Cache key for a query; the vectorizer lowercases and tokenizes on whitespace anyway."""
+    return " ".join(query.lower().split())
+
+def _prediction_cache(classifier) -> LRUCache:
+    """Per-instance prediction cache; call with _CACHE_LOCK held."""
+    cache = _PREDICTION_CACHES.get(classifier)
+    if cache is None:
+        cache = _PREDICTION_CACHES[classifier] = LRUCache(maxsize=4096)
+    return cache
+
 def predict_category(query: str) -> Tuple[str, float, Dict[str, float]]:
     """
     Predict the category of a user query with confidence scores.
-    Uses lazy-loaded classifier from ModelManager.
+    Uses lazy-loaded classifier from ModelManager. Results are cached per
+    classifier instance and normalized query (LRU, 4096 entries).
     
     Returns:
         (category: str, max_confidence: float, probabilities: Dict[str, float])
@@ -16,19 +37,87 @@ def predict_category(query: str) -> Tuple[str, float, Dict[str, float]]:
         # Fallback if classifier failed to load
         return "General", 0.0, {}
 
-    # Get prediction
-    category = classifier.predict([query])[0]
+    normalized = _normalize_query(query)
+    with _CACHE_LOCK:
+        cached = _prediction_cache(classifier).get(normalized)
+    if cached is None:
+        categories, confidences, probs = _predict_rows(classifier, [normalized], 1)
+        cached = (categories[0], confidences[0], probs[0])
+        with _CACHE_LOCK:
+            _prediction_cache(classifier)[normalized] = cached
+    
+    category, max_confidence, probs = cached
+    # Copy so callers can't mutate the cached dict
+    return category, max_confidence, dict(probs)
+
+def _predict_rows(model, rows, batch_size: int) -> Tuple[List[str], List[float], List[Dict[str, float]]]:
+    """Run `model` over `rows` (raw queries or feature rows) in sub-batches."""
+    categories, confidences, probs = [], [], []
+    has_proba = hasattr(model, 'predict_proba')
+    n_rows = rows.shape[0] if hasattr(rows, 'shape') else len(rows)  # sparse matrices have no len()
+    
+    for start in range(0, n_rows, batch_size):
+        chunk = rows[start:start + batch_size]
+        chunk_categories = list(model.predict(chunk))
+        categories.extend(chunk_categories)
+        
+        if has_proba:
+            probs_matrix = model.predict_proba(chunk)
+            classes = model.classes_
+            confidences.extend(float(c) for c in probs_matrix.max(axis=1))
+            probs.extend(
+                {classes[i]: float(row[i]) for i in range(len(classes))}
+                for row in probs_matrix
+            )
+        else:
+            # Fallback: assume high confidence if no proba available
+            confidences.extend([1.0] * len(chunk_categories))
+            probs.extend({category: 1.0} for category in chunk_categories)
+    
+    return categories, confidences, probs
+
+def predict_category_batch(
+    queries: List[str], batch_size: int = 64
+) -> Tuple[List[str], List[float], List[Dict[str, float]]]:
+    """
+    Batched variant of predict_category.
+    Runs the classifier once per sub-batch of `batch_size` queries instead of
+    once per query.
+    
+    Returns:
+        (categories: List[str], max_confidences: List[float], probabilities: List[Dict[str, float]])
+    """
+    classifier = ModelManager.get_classifier()
     
-    # Get probability for each class
-    if hasattr(classifier, 'predict_proba'):
-        probs_array = classifier.predict_proba([query])[0]
-        classes = classifier.classes_
-        probs_dict = {classes[i]: float(probs_array[i]) for i in range(len(classes))}
-        max_confidence = float(np.max(probs_array))
-    else:
-        # Fallback: assume high confidence if no proba available
-        probs_dict = {category: 1.0}
-        max_confidence = 1.0
+    if classifier is None:
+        # Fallback if classifier failed to load
+        n = len(queries)
+        return ["General"] * n, [0.0] * n, [{} for _ in range(n)]
     
-    return category, max_confidence, probs_dict
+    return _predict_rows(classifier, [_normalize_query(q) for q in queries], batch_size)
 
+def vectorize_queries(queries: List[str]):
+    """
+    Run only the feature-extraction steps of the classifier pipeline.
+    Lets callers with a fixed query set (e.g. evaluation datasets) vectorize
+    once and reuse the matrix with predict_category_features.
+    
+    Returns:
+        Feature matrix, or None if the classifier is missing or not a pipeline.
+    """
+    classifier = ModelManager.get_classifier()
+    if classifier is None or len(getattr(classifier, 'steps', [])) < 2:
+        return None
+    return classifier[:-1].transform([_normalize_query(q) for q in queries])
+
+def predict_category_features(
+    features, batch_size: int = 64
+) -> Tuple[List[str], List[float], List[Dict[str, float]]]:
+    """
+    Predict from a matrix produced by vectorize_queries, skipping tokenization.
+    
+    Returns:
+        (categories: List[str], max_confidences: List[float], probabilities: List[Dict[str, float]])
+    """
+    classifier = ModelManager.get_classifier()
+    return _predict_rows(classifier[-1], features, batch_size)
@@ -63,6 +63,9 @@ class Settings(BaseSettings):
     
     # Enable scope checking
     USE_SCOPE_GUARD: bool = True
+
+    # Reject queries that match no college keyword (default: let the bots decide)
+    STRICT_SCOPE_GUARD: bool = False
     
     # Debug mode (verbose logging)
     DEBUG: bool = False
@@ -86,6 +89,12 @@ class Settings(BaseSettings):
     WEB_SEARCH_ENABLED: bool = True
     WEB_CACHE_TTL: int = 3600  # 1 hour
 
+    # ============ SERVER ============
+    # Seconds a cached /chat answer is reused, so knowledge updates show up
+    RESPONSE_CACHE_TTL: int = 600  # 10 minutes
+    # Token for admin routes (X-Admin-Token header); empty disables them
+    ADMIN_TOKEN: str = "" # Set via env var ADMIN_TOKEN
+
 
 settings = Settings()
 
@@ -0,0 +1,48 @@
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "Mozilla/5.0"
+
+# Cap on simultaneous connections for the bulk async fetchers. Every one of
+# them hits rvrjcce.ac.in, so this is also the per-host limit.
+MAX_CONCURRENT_REQUESTS = 16
+
+
+def create_session(user_agent: str = USER_AGENT, pool_maxsize: int = 32) -> requests.Session:
+    """
+    Pooled keep-alive requests session with retries.
+
+    Repeated fetches from the same host reuse the TCP/TLS connection instead
+    of opening a new one per call, and transient failures are retried with
+    a short backoff.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=3, backoff_factor=0.2),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": user_agent})
+    return session
+
+
+def create_async_client(timeout: float, user_agent: str = USER_AGENT) -> httpx.AsyncClient:
+    """
+    httpx client for the asyncio bulk fetchers: at most MAX_CONCURRENT_REQUESTS
+    pooled connections, redirects followed, connection failures retried.
+    """
+    limits = httpx.Limits(
+        max_connections=MAX_CONCURRENT_REQUESTS,
+        max_keepalive_connections=MAX_CONCURRENT_REQUESTS,
+    )
+    return httpx.AsyncClient(
+        headers={"User-Agent": user_agent},
+        timeout=timeout,
+        follow_redirects=True,
+        transport=httpx.AsyncHTTPTransport(retries=3, limits=limits),
+    )
@@ -7,6 +7,7 @@ import numpy as np
 from sentence_transformers import SentenceTransformer
 from core.logger import get_logger
 import shutil
+import threading
 
 
 logger = get_logger("model_manager")
@@ -20,6 +21,16 @@ class ModelManager:
     _embedder = None
     _classifier = None
     
+    # One lock per resource: concurrent first calls load it once, while
+    # different resources can still load in parallel (see server.warmup_models)
+    _embedder_lock = threading.Lock()
+    _classifier_lock = threading.Lock()
+    _domain_locks = {}  # domain folder -> Lock
+    _domain_locks_guard = threading.Lock()
+    _rebuild_lock = threading.Lock()
+    _bot3_lock = threading.Lock()
+    _aiml_lock = threading.Lock()
+    
     # Bot 2 resources
     _bot2_index = None
     _bot2_qa_pairs = None
@@ -34,36 +45,43 @@ class ModelManager:
     def _get_abs_path(cls, rel_path: str) -> str:
         return os.path.join(cls.BASE_DIR, rel_path)
 
+    @classmethod
+    def _domain_lock(cls, folder: str) -> threading.Lock:
+        with cls._domain_locks_guard:
+            return cls._domain_locks.setdefault(folder, threading.Lock())
+
     @classmethod
     def get_embedder(cls) -> SentenceTransformer:
         """Lazy load shared embedding model."""
-        if cls._embedder is None:
-            logger.info("Lazy-loading embedding model (all-MiniLM-L6-v2)...")
-            try:
-                cls._embedder = SentenceTransformer("all-MiniLM-L6-v2")
-                logger.info("[OK] Embedding model loaded.")
-            except Exception as e:
-                logger.error(f"Failed to load embedding model: {e}")
-                raise
+        with cls._embedder_lock:
+            if cls._embedder is None:
+                logger.info("Lazy-loading embedding model (all-MiniLM-L6-v2)...")
+                try:
+                    cls._embedder = SentenceTransformer("all-MiniLM-L6-v2")
+                    logger.info("[OK] Embedding model loaded.")
+                except Exception as e:
+                    logger.error(f"Failed to load embedding model: {e}")
+                    raise
         return cls._embedder
 
     @classmethod
     def get_classifier(cls):
         """Lazy load intent classifier."""
-        if cls._classifier is None:
-            path = cls._get_abs_path("classifier/classifier.pkl")
-            if os.path.exists(path):
-                logger.info(f"Lazy-loading classifier from {path}...")
-                try:
-                    cls._classifier = joblib.load(path)
-                    logger.info("[OK] Classifier loaded.")
-                except Exception as e:
-                    logger.error(f"Failed to load classifier: {e}")
-                    raise
-            else:
-                logger.warning(f"Classifier not found at {path}. Using fallback/mock if allowed.")
-                # We might return None, let caller handle it
-                return None
+        with cls._classifier_lock:
+            if cls._classifier is None:
+                path = cls._get_abs_path("classifier/classifier.pkl")
+                if os.path.exists(path):
+                    logger.info(f"Lazy-loading classifier from {path}...")
+                    try:
+                        cls._classifier = joblib.load(path)
+                        logger.info("[OK] Classifier loaded.")
+                    except Exception as e:
+                        logger.error(f"Failed to load classifier: {e}")
+                        raise
+                else:
+                    logger.warning(f"Classifier not found at {path}. Using fallback/mock if allowed.")
+                    # We might return None, let caller handle it
+                    return None
         return cls._classifier
 
     # Cache for separate domain indices: {domain_name: (index, qa_pairs)}
@@ -103,47 +121,54 @@ class ModelManager:
         if target_folder in cls._domain_resources:
             return cls._domain_resources[target_folder]
             
-        # Path construction
-        # embeddings/domains/{folder}/qa_index.faiss
-        base_path = cls._get_abs_path(f"embeddings/domains/{target_folder}")
-        index_path = os.path.join(base_path, "qa_index.faiss")
-        qa_path = os.path.join(base_path, "qa_metadata.pkl")
+        with cls._domain_lock(target_folder):
+            if target_folder in cls._domain_resources:
+                return cls._domain_resources[target_folder]
+            
+            # Path construction
+            # embeddings/domains/{folder}/qa_index.faiss
+            base_path = cls._get_abs_path(f"embeddings/domains/{target_folder}")
+            index_path = os.path.join(base_path, "qa_index.faiss")
+            qa_path = os.path.join(base_path, "qa_metadata.pkl")
         
-        # Check if resources exist, if not, attempt rebuild
-        if not (os.path.exists(index_path) and os.path.exists(qa_path)):
-            logger.warning(f"Resources missing for '{target_folder}'. Attempting automatic rebuild...")
-            cls.rebuild_domain_indices()
+            # Check if resources exist, if not, attempt rebuild
+            if not (os.path.exists(index_path) and os.path.exists(qa_path)):
+                # One rebuild at a time; it rewrites every domain's files
+                with cls._rebuild_lock:
+                    if not (os.path.exists(index_path) and os.path.exists(qa_path)):
+                        logger.warning(f"Resources missing for '{target_folder}'. Attempting automatic rebuild...")
+                        cls.rebuild_domain_indices()
         
-        logger.info(f"Lazy-loading domain resources for '{target_folder}'...")
+            logger.info(f"Lazy-loading domain resources for '{target_folder}'...")
         
-        index = None
-        qa_pairs = []
+            index = None
+            qa_pairs = []
         
-        if os.path.exists(index_path) and os.path.exists(qa_path):
-            try:
-                index = faiss.read_index(index_path)
-                with open(qa_path, "rb") as f:
-                    qa_pairs = pickle.load(f)
+            if os.path.exists(index_path) and os.path.exists(qa_path):
+                try:
+                    index = faiss.read_index(index_path)
+                    with open(qa_path, "rb") as f:
+                        qa_pairs = pickle.load(f)
                 
-                # VALIDATION LOGS
-                logger.info(f"STATUS REPORT: Bot-2 Resources for '{target_folder}'")
-                logger.info(f"  - FAISS Index Vectors: {index.ntotal}")
-                logger.info(f"  - QA Entries Loaded: {len(qa_pairs)}")
+                    # VALIDATION LOGS
+                    logger.info(f"STATUS REPORT: Bot-2 Resources for '{target_folder}'")
+                    logger.info(f"  - FAISS Index Vectors: {index.ntotal}")
+                    logger.info(f"  - QA Entries Loaded: {len(qa_pairs)}")
                 
-                if len(qa_pairs) == 0:
-                     logger.error(f"CRITICAL: QA dataset for '{target_folder}' is empty!")
-                     return None, []
+                    if len(qa_pairs) == 0:
+                         logger.error(f"CRITICAL: QA dataset for '{target_folder}' is empty!")
+                         return None, []
                      
-            except Exception as e:
-                logger.error(f"Failed to load {target_folder} resources: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-        else:
-            logger.error(f"CRITICAL: Failed to build/find resources for {target_folder} at {base_path}")
-            return None, []
+                except Exception as e:
+                    logger.error(f"Failed to load {target_folder} resources: {e}")
+                    import traceback
+                    logger.error(traceback.format_exc())
+            else:
+                logger.error(f"CRITICAL: Failed to build/find resources for {target_folder} at {base_path}")
+                return None, []
             
-        cls._domain_resources[target_folder] = (index, qa_pairs)
-        return index, qa_pairs
+            cls._domain_resources[target_folder] = (index, qa_pairs)
+            return index, qa_pairs
 
     @classmethod
     def rebuild_domain_indices(cls):
@@ -258,36 +283,37 @@ class ModelManager:
         Lazy load Bot-3 FAISS index and Metadata.
         Returns: (index, metadata)
         """
-        if cls._bot3_index is None or cls._bot3_metadata is None:
-            index_path = cls._get_abs_path("embeddings/bot3_faiss_NEW/index.faiss")
-            meta_path = cls._get_abs_path("embeddings/bot3_faiss_NEW/metadata.pkl")
+        with cls._bot3_lock:
+            if cls._bot3_index is None or cls._bot3_metadata is None:
+                index_path = cls._get_abs_path("embeddings/bot3_faiss_NEW/index.faiss")
+                meta_path = cls._get_abs_path("embeddings/bot3_faiss_NEW/metadata.pkl")
             
-            logger.info("Lazy-loading Bot-3 resources...")
+                logger.info("Lazy-loading Bot-3 resources...")
             
-            # Load Index
-            if os.path.exists(index_path):
-                try:
-                    cls._bot3_index = faiss.read_index(index_path)
-                    logger.info(f"[OK] Bot-3 FAISS index loaded ({cls._bot3_index.ntotal} items).")
-                except Exception as e:
-                    logger.error(f"Failed to load Bot-3 FAISS index: {e}")
+                # Load Index
+                if os.path.exists(index_path):
+                    try:
+                        cls._bot3_index = faiss.read_index(index_path)
+                        logger.info(f"[OK] Bot-3 FAISS index loaded ({cls._bot3_index.ntotal} items).")
+                    except Exception as e:
+                        logger.error(f"Failed to load Bot-3 FAISS index: {e}")
+                        cls._bot3_index = None
+                else:
+                    logger.warning(f"Bot-3 index missing at {index_path}")
                     cls._bot3_index = None
-            else:
-                logger.warning(f"Bot-3 index missing at {index_path}")
-                cls._bot3_index = None
                 
-            # Load Metadata
-            if os.path.exists(meta_path):
-                try:
-                    with open(meta_path, "rb") as f:
-                        cls._bot3_metadata = pickle.load(f)
-                    logger.info(f"[OK] Bot-3 metadata loaded ({len(cls._bot3_metadata)} items).")
-                except Exception as e:
-                    logger.error(f"Failed to load Bot-3 metadata: {e}")
+                # Load Metadata
+                if os.path.exists(meta_path):
+                    try:
+                        with open(meta_path, "rb") as f:
+                            cls._bot3_metadata = pickle.load(f)
+                        logger.info(f"[OK] Bot-3 metadata loaded ({len(cls._bot3_metadata)} items).")
+                    except Exception as e:
+                        logger.error(f"Failed to load Bot-3 metadata: {e}")
+                        cls._bot3_metadata = []
+                else:
+                    logger.warning(f"Bot-3 metadata missing at {meta_path}")
                     cls._bot3_metadata = []
-            else:
-                logger.warning(f"Bot-3 metadata missing at {meta_path}")
-                cls._bot3_metadata = []
                 
         return cls._bot3_index, cls._bot3_metadata
 
@@ -301,28 +327,29 @@ class ModelManager:
         """
         import aiml
         
-        if cls._aiml_kernel is None:
-            logger.info("Lazy-loading AIML kernel...")
-            kernel = aiml.Kernel()
+        with cls._aiml_lock:
+            if cls._aiml_kernel is None:
+                logger.info("Lazy-loading AIML kernel...")
+                kernel = aiml.Kernel()
             
-            # Load AIML files
-            aiml_files = [
-                "data/aiml/rvrjcce_comprehensive.aiml"
-            ]
+                # Load AIML files
+                aiml_files = [
+                    "data/aiml/rvrjcce_comprehensive.aiml"
+                ]
             
-            loaded_count = 0
-            for aiml_path in aiml_files:
-                if os.path.exists(aiml_path):
-                    try:
-                        kernel.learn(aiml_path)
-                        loaded_count += 1
-                        logger.info(f"[OK] Loaded AIML file: {aiml_path}")
-                    except Exception as e:
-                        logger.error(f"Error loading AIML file {aiml_path}: {e}")
-                else:
-                    logger.warning(f"AIML file not found at {aiml_path}")
+                loaded_count = 0
+                for aiml_path in aiml_files:
+                    if os.path.exists(aiml_path):
+                        try:
+                            kernel.learn(aiml_path)
+                            loaded_count += 1
+                            logger.info(f"[OK] Loaded AIML file: {aiml_path}")
+                        except Exception as e:
+                            logger.error(f"Error loading AIML file {aiml_path}: {e}")
+                    else:
+                        logger.warning(f"AIML file not found at {aiml_path}")
             
-            cls._aiml_kernel = kernel
-            logger.info(f"[OK] AIML kernel ready ({loaded_count} files loaded).")
+                cls._aiml_kernel = kernel
+                logger.info(f"[OK] AIML kernel ready ({loaded_count} files loaded).")
             
         return cls._aiml_kernel
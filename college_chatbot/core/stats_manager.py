@@ -3,7 +3,7 @@ import json
 import os
 from collections import Counter
 from threading import Lock
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional
 
 from core.logger import get_logger
 
@@ -46,14 +46,13 @@ class StatsManager:
         except Exception as e:
             logger.error(f"Failed to save stats: {e}")
 
-    @classmethod
-    def increment_query_count(cls, query: str):
+    @staticmethod
+    def _format_query(query: str) -> Optional[str]:
         """
-        Increment the frequency count for a given query.
-        Normalizes the query (lowercase, stripped) to aggregate similar variations.
+        Key a query is counted under, or None if it is too short to track.
         """
         if not query or len(query.strip()) < 3:
-            return 
+            return None
             
         normalized_query = query.strip() # Keep case for display? Or normalize? 
         # Better to keep original casing for display if possible, but map to lowercase key.
@@ -72,7 +71,18 @@ class StatsManager:
         formatted_query = query.strip()
         if formatted_query:
             formatted_query = formatted_query[0].upper() + formatted_query[1:]
-        
+        return formatted_query
+
+    @classmethod
+    def increment_query_count(cls, query: str):
+        """
+        Increment the frequency count for a given query.
+        Normalizes the query (lowercase, stripped) to aggregate similar variations.
+        """
+        formatted_query = cls._format_query(query)
+        if formatted_query is None:
+            return
+
         with FILE_LOCK:
             stats = cls._load_stats()
             current_count = stats.get(formatted_query, 0)
@@ -80,6 +90,23 @@ class StatsManager:
             cls._save_stats(stats)
             logger.info(f"Incremented stats for: '{formatted_query}' (Count: {current_count + 1})")
 
+    @classmethod
+    def increment_many(cls, queries: Iterable[str]):
+        """
+        Increment the counts for several queries with a single load/save of
+        the stats file, instead of one round trip per query.
+        """
+        counts = Counter(filter(None, map(cls._format_query, queries)))
+        if not counts:
+            return
+
+        with FILE_LOCK:
+            stats = cls._load_stats()
+            for formatted_query, n in counts.items():
+                stats[formatted_query] = stats.get(formatted_query, 0) + n
+            cls._save_stats(stats)
+            logger.info(f"Incremented stats for {len(counts)} queries ({sum(counts.values())} hits)")
+
     @classmethod
     def get_top_queries(cls, n: int = 4) -> List[str]:
         """
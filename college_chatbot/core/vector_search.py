@@ -0,0 +1,21 @@
+
+import faiss
+import numpy as np
+
+
+def search_l2(index, query_vectors: np.ndarray, k: int):
+    """
+    Search a FAISS index and return (distances, indices) as squared L2.
+
+    Indices built over unit vectors with METRIC_INNER_PRODUCT return cosine
+    similarities instead. For unit vectors ||q - x||^2 = 2 - 2 * q.x, so
+    those are converted back here and callers keep a single scoring rule
+    (1 / (1 + distance)) and the same thresholds for either kind of index.
+    """
+    if index.metric_type != faiss.METRIC_INNER_PRODUCT:
+        return index.search(query_vectors, k)
+
+    query_vectors = np.ascontiguousarray(query_vectors, dtype=np.float32)
+    query_vectors = query_vectors / np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    similarities, indices = index.search(query_vectors, k)
+    return np.maximum(2.0 - 2.0 * similarities, 0.0), indices
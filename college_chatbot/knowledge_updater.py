@@ -32,6 +32,7 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger("knowledge_updater")
 
 from core.model_manager import ModelManager
+from core.vector_search import search_l2
 from bots.bot3_rag import (
     load_documents_from_directory, 
     chunk_all_documents, 
@@ -180,7 +181,7 @@ def reevaluate_unresolved_queries():
         q_vec = embed_model.encode([q_text]).astype(np.float32)
         
         # Search
-        D, I = index.search(q_vec, 1)
+        D, I = search_l2(index, q_vec, 1)
         dist = D[0][0]
         idx = I[0][0]
         
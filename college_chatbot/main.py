@@ -30,19 +30,19 @@ Logging & Observability:
   - Audit trail for compliance & model improvement
 """
 
+import asyncio
+import threading
 import time
 from typing import List, Optional, Tuple
 
-from bots.bot2_semantic import bot2_answer
-from bots.bot3_rag import bot3_answer
-from bots.rule_bot import get_rule_response
+import bots
 from classifier.classifier import predict_category
 from config.settings import settings
 from core.audit_logger import get_audit_logger
 from core.context import create_context
 from core.logger import get_logger
 from services.query_validator import validate_query
-from services.scope_guard import scope_check
+from services.scope_guard import OUT_OF_SCOPE_RESPONSE, is_rag_forbidden, scope_check
 
 logger = get_logger("orchestrator")
 audit_logger = get_audit_logger("main")
@@ -52,6 +52,17 @@ audit_logger = get_audit_logger("main")
 HIGH_CONF_THRESHOLD = settings.CLASSIFIER_HIGH_CONF
 MID_CONF_THRESHOLD = settings.CLASSIFIER_MID_CONF
 
+# Per-thread outcome of the most recent handle_query() call
+_query_outcome = threading.local()
+
+
+def last_query_tracked() -> bool:
+    """
+    Whether the last handle_query() on this thread was a successful, in-scope
+    answer (i.e. one counted in the usage stats).
+    """
+    return getattr(_query_outcome, "tracked", False)
+
 
 def handle_query(query: str, history: Optional[List[Tuple[str, str]]] = None) -> str:
     """
@@ -68,6 +79,7 @@ def handle_query(query: str, history: Optional[List[Tuple[str, str]]] = None) ->
     # Initialize context (query_id, timing, metadata)
     ctx = create_context(query)
     stage_times = {}
+    _query_outcome.tracked = False
     
     if history is None:
         history = []
@@ -112,7 +124,7 @@ def handle_query(query: str, history: Optional[List[Tuple[str, str]]] = None) ->
         stage_start = time.time()
         
         logger.info(f"[{ctx['query_id']}] [STAGE 2] Scope Check")
-        in_scope, scope_reason = scope_check(query)
+        in_scope, scope_reason = scope_check(query, strict=settings.STRICT_SCOPE_GUARD)
         ctx["scope"] = {"in_scope": in_scope, "reason": scope_reason}
         # Handle Greetings specifically
         if scope_reason == "greeting":
@@ -186,8 +198,6 @@ def handle_query(query: str, history: Optional[List[Tuple[str, str]]] = None) ->
         # ============ [STAGE 4] ROUTING DECISION ============
         stage_start = time.time()
         
-        from services.scope_guard import OUT_OF_SCOPE_RESPONSE, is_rag_forbidden
-
         logger.info(f"[{ctx['query_id']}] [STAGE 4] Routing Decision")
         
         routed_to_bot = None
@@ -264,7 +274,7 @@ def handle_query(query: str, history: Optional[List[Tuple[str, str]]] = None) ->
                 try:
                     logger.info(f"[{ctx['query_id']}] Checking BOT-1 (Rule-based)...")
                     # Bot-1 is fast, but we only use it if it has a specific response
-                    rule_resp = get_rule_response(query)
+                    rule_resp = bots.get_rule_response(query)
                     if rule_resp and rule_resp != "Sorry, I don't have information on that.":
                          logger.info(f"[{ctx['query_id']}] [SUCCESS] BOT-1 found answer")
                          response = rule_resp
@@ -280,7 +290,7 @@ def handle_query(query: str, history: Optional[List[Tuple[str, str]]] = None) ->
                 try:
                     logger.info(f"[{ctx['query_id']}] Checking BOT-2 (Semantic)...")
                     # Pass category for domain-specific retrieval
-                    b2_ans, b2_score, b2_conf = bot2_answer(query, ctx['query_id'], category=category)
+                    b2_ans, b2_score, b2_conf = bots.bot2_answer(query, ctx['query_id'], category=category)
                     ctx["bot2_similarity"] = b2_score
                     
                     if b2_conf:
@@ -311,7 +321,7 @@ def handle_query(query: str, history: Optional[List[Tuple[str, str]]] = None) ->
             try:
                 logger.info(f"[{ctx['query_id']}] Escalating to BOT-3 (RAG)...")
                 # Bot-3 returns (answer, confidence, is_confident)
-                rag_result = bot3_answer(query, history, ctx['query_id'])
+                rag_result = bots.bot3_answer(query, history, ctx['query_id'])
                 
                 # Unwrap tuple (safe handling for legacy return if any)
                 if isinstance(rag_result, tuple):
@@ -428,6 +438,7 @@ def handle_query(query: str, history: Optional[List[Tuple[str, str]]] = None) ->
         status_text = "FAILURE" if ctx.get('error') or (ans_text and ans_text.startswith("[ERROR]")) else "SUCCESS"
         
         if status_text == "SUCCESS" and cat_text != "Greeting" and cat_text != "Out of Scope":
+            _query_outcome.tracked = True
             # Track Usage Stats
             try:
                 from core.stats_manager import StatsManager
@@ -445,6 +456,16 @@ def handle_query(query: str, history: Optional[List[Tuple[str, str]]] = None) ->
         )
         logger.info(f"[{ctx['query_id']}] " + "="*70)
 
+async def handle_query_async(query: str, history: Optional[List[Tuple[str, str]]] = None) -> str:
+    """
+    Awaitable handle_query() for async callers.
+    
+    The pipeline itself is synchronous (classifier, FAISS, the Ollama client),
+    so it runs on a worker thread; the event loop stays free and concurrent
+    queries overlap their model/LLM waits.
+    """
+    return await asyncio.to_thread(handle_query, query, history)
+
 def validate_system():
     """Run critical startup checks."""
     try:
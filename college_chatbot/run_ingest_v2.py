@@ -1,4 +1,5 @@
 
+import asyncio
 import sys
 import os
 import time
@@ -6,7 +7,7 @@ import time
 # Ensure project root is in path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from services.web_ingest import ingest_url
+from services.web_ingest import ingest_urls
 
 URLS = [
     # Main
@@ -63,20 +64,21 @@ URLS = [
 
 print(f"Starting ingestion of {len(URLS)} URLs...")
 
+# All pages are fetched concurrently; results come back in URLS order
+results = asyncio.run(ingest_urls(URLS))
+
 success_count = 0
 with open("ingest_log_v2.txt", "w") as log:
-    for u in URLS:
-        try:
-            print(f"Fetching: {u}")
-            log.write(f"Fetching: {u}\n")
-            fp = ingest_url(u)
-            print(f"  -> Saved: {fp}")
-            log.write(f"  -> Saved: {fp}\n")
-            success_count += 1
-            # time.sleep(0.5) # Reduced sleep
-        except Exception as e:
-            print(f"  -> FAILED: {u} | Error: {e}")
-            log.write(f"  -> FAILED: {u} | Error: {e}\n")
+    for u, result in zip(URLS, results):
+        print(f"Fetching: {u}")
+        log.write(f"Fetching: {u}\n")
+        if isinstance(result, Exception):
+            print(f"  -> FAILED: {u} | Error: {result}")
+            log.write(f"  -> FAILED: {u} | Error: {result}\n")
+            continue
+        print(f"  -> Saved: {result}")
+        log.write(f"  -> Saved: {result}\n")
+        success_count += 1
 
 print(f"Ingestion complete. Successfully saved {success_count}/{len(URLS)} pages.")
 print("Don't forget to rebuild the Bot-3 index!")
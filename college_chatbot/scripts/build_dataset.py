@@ -1,12 +1,18 @@
 
 import os
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+import sys
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urljoin
+import re
 import time
 import json
 import logging
 
+# Ensure project root is in path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.http import create_session
+
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("RVRJC_Crawler")
@@ -36,15 +42,24 @@ def clean_text(text):
     cleaned = '\n'.join(chunk for chunk in chunks if chunk)
     return cleaned
 
+# Deep links worth following: absolute URLs whose host contains the college
+# domain and that mention php or pdf anywhere (pages, documents, ?query and
+# #fragment links alike), checked in one pass instead of urlparse + substrings
+VALID_LINK_RE = re.compile(
+    r"^(?=.*?(?:pdf|php))[A-Za-z][A-Za-z0-9+.\-]*://[^/?#]*" + re.escape(ALLOWED_DOMAIN),
+    re.DOTALL,
+)
+SKIP_HREF_PREFIXES = ("#", "mailto:", "tel:", "javascript:")
+
 def is_valid_url(url):
-    parsed = urlparse(url)
-    return bool(parsed.netloc) and bool(parsed.scheme) and ALLOWED_DOMAIN in parsed.netloc
+    return VALID_LINK_RE.match(url) is not None
 
 def crawl_and_save():
     """Crawls prioritized pages and saves structured text."""
     logger.info("Starting targeted crawl of RVR&JC College website...")
     
     unique_links = set()
+    session = create_session(user_agent="RVRJC-Bot/1.0")
     
     # 1. First Pass: Targeted Sections
     for section_name, path in TARGET_SECTIONS.items():
@@ -53,52 +68,60 @@ def crawl_and_save():
         
         try:
             logger.info(f"Crawling: {url}")
-            response = requests.get(url, timeout=10)
+            response = session.get(url, timeout=10, stream=True)
             if response.status_code != 200:
                 logger.warning(f"Failed to fetch {url}: {response.status_code}")
+                response.close()
+                continue
+            
+            # Skip non-HTML payloads (e.g. PDFs) without downloading the body
+            if "text/html" not in response.headers.get("content-type", ""):
+                logger.info(f"Skipping non-HTML content at {url}")
+                response.close()
                 continue
                 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Let requests decode once; the parser gets a str and skips sniffing
+            tree = LexborHTMLParser(response.text)
             
             # Remove scripts and styles
-            for script in soup(["script", "style", "nav", "footer"]):
-                script.decompose()
+            for node in tree.css("script, style, nav, footer"):
+                node.decompose()
                 
             # Extract main content (Heuristic based on RVRJC structure)
             # Usually in a container or main div. Fallback to body.
-            main_content = soup.find('div', class_='content') or soup.find('div', class_='main') or soup.body
+            main_content = tree.css_first('div.content') or tree.css_first('div.main') or tree.body
             
             if main_content:
-                text = clean_text(main_content.get_text())
-                if len(text) < 100:
-                    text = clean_text(soup.body.get_text())
+                text = clean_text(main_content.text(separator="\n"))
+                if len(text) < 100 and tree.body:
+                    text = clean_text(tree.body.text(separator="\n"))
             else:
-                 text = clean_text(soup.get_text())
+                 text = clean_text(tree.root.text(separator="\n") if tree.root else "")
 
             # Save to file
             filename = f"rvrjc_{section_name}_{int(time.time())}.txt"
             filepath = os.path.join(DATA_DIR, filename)
             
+            payload = f"Source: {url}\nSection: {section_name.upper()}\n{'-' * 50}\n{text}"
             with open(filepath, "w", encoding="utf-8") as f:
-                f.write(f"Source: {url}\n")
-                f.write(f"Section: {section_name.upper()}\n")
-                f.write("-" * 50 + "\n")
-                f.write(text)
+                f.write(payload)
                 
             logger.info(f"Saved {len(text)} chars to {filename}")
             
             # Find more relevant links in this page
-            for link in soup.find_all('a', href=True):
-                href = link['href']
+            for link in tree.css('a[href]'):
+                href = (link.attributes.get('href') or "").strip()
+                if not href or href.startswith(SKIP_HREF_PREFIXES):
+                    continue
                 full_url = urljoin(url, href)
-                if is_valid_url(full_url) and full_url not in unique_links:
-                     # Only add specific deep links (e.g., pdfs or sub-pages)
-                     if "pdf" in full_url or "php" in full_url:
-                         unique_links.add(full_url)
+                # Only add specific deep links (e.g., pdfs or sub-pages)
+                if full_url not in unique_links and is_valid_url(full_url):
+                    unique_links.add(full_url)
 
         except Exception as e:
             logger.error(f"Error processing {url}: {e}")
             
+    session.close()
     logger.info("Crawl completed. Data stored in data/bot3_docs/")
 
 if __name__ == "__main__":
@@ -1,10 +1,36 @@
 
+import numpy as np
 import pandas as pd
 import os
+import re
 
 INPUT_FILE = "data/classifier_data.csv"
 OUTPUT_FILE = "data/classifier_data_cleaned.csv"
 
+KNOWN_CATEGORIES = [
+    "Academic Affairs",
+    "Admissions & Registrations",
+    "Campus Life",
+    "Cross-Domain Queries",
+    "Financial Matters",
+    "General Information",
+    "Student Services",
+]
+
+# Keyword alternations used by the correction rules, compiled once so every
+# row is matched in C instead of re-scanning Python keyword lists.
+HOSTEL_FEE_RE = re.compile(r"fee|cost|charge|amount|payment|bill")
+HOSTEL_APPLY_RE = re.compile(r"apply|application|room change|allotment|register")
+HOSTEL_LIFE_RE = re.compile(
+    r"available|facility|facilities|mess|rules|time|timing|boys|girls|accommodation|stay"
+)
+TRANSPORT_RE = re.compile(r"bus|transport")
+TRANSPORT_FEE_RE = re.compile(r"fee|cost|charge|pay")
+ADMISSION_RE = re.compile(r"admission|eapcet|cutoff|rank|quota|management")
+FEE_RE = re.compile(r"fee|tuition|scholarship|fine|due|payment")
+LIBRARY_RE = re.compile(r"library|book")
+PLACEMENT_RE = re.compile(r"placement|package|recruit|company|companies|internship")
+
 def clean_data():
     if not os.path.exists(INPUT_FILE):
         print(f"Error: {INPUT_FILE} not found.")
@@ -14,9 +40,20 @@ def clean_data():
     print(f"Original Row Count: {len(df)}")
     
     # 1. Standardize Columns
+    # Set dtypes only after stripping, so headers with stray whitespace still
+    # match. Category holds a handful of repeated labels, so it is a categorical.
     df.columns = [c.strip() for c in df.columns]
+    df = df.astype({'Question': 'string', 'Category': 'category'})
+    
+    # 2. Drop Duplicates
+    # Drop rows where Question is identical before classifying, so the rules
+    # only run once per distinct question. Keeping the last row matches the
+    # label the corrected output used to keep.
+    before_dedup = len(df)
+    df = df.drop_duplicates(subset=['Question'], keep='last').reset_index(drop=True)
+    print(f"Dropped {before_dedup - len(df)} duplicate questions.")
     
-    # 2. Define Rules for consistency
+    # 3. Define Rules for consistency
     # (keyword, target_category)
     # Priority: The checks are sequential. First match wins? No, we should be careful.
     # Let's iterate and apply corrections.
@@ -24,45 +61,44 @@ def clean_data():
     corrections = 0
     
     def get_corrected_category(row):
-        q = str(row['Question']).lower()
-        cat = str(row['Category']).strip()
+        q = row.q_lower
+        cat = str(row.Category).strip()
         
         # --- HOSTEL RULES ---
         if "hostel" in q:
-            if any(x in q for x in ["fee", "cost", "charge", "amount", "payment", "bill"]):
+            if HOSTEL_FEE_RE.search(q):
                 return "Financial Matters"
-            elif any(x in q for x in ["apply", "application", "room change", "allotment", "register"]):
+            elif HOSTEL_APPLY_RE.search(q):
                 return "Student Services"
-            elif any(x in q for x in ["available", "facility", "facilities", "mess", "rules", "time", "timing", "boys", "girls", "accommodation", "stay"]):
+            elif HOSTEL_LIFE_RE.search(q):
                 return "Campus Life"
             # Default for hostel availability
             if "hostel" in q and "available" in q:
                 return "Campus Life"
                 
         # --- BUS / TRANSPORT RULES ---
-        if "bus" in q or "transport" in q:
-            if any(x in q for x in ["fee", "cost", "charge", "pay"]):
+        if TRANSPORT_RE.search(q):
+            if TRANSPORT_FEE_RE.search(q):
                 return "Financial Matters"
             return "Campus Life" # Routes, timings, availability
             
         # --- ADMISSION RULES ---
-        if "admission" in q or "eapcet" in q or "cutoff" in q or "rank" in q or "quota" in q or "management" in q:
+        if ADMISSION_RE.search(q):
             # Some fee questions might overlap, but generally Admission & Registration
             if "fee" in q and "structure" in q: 
                  return "Financial Matters" 
             return "Admissions & Registrations"
 
         # --- FEE RULES ---
-        if "fee" in q or "tuition" in q or "scholarship" in q or "fine" in q or "due" in q or "payment" in q:
+        if FEE_RE.search(q):
             return "Financial Matters"
             
         # --- LIBRARY ---
-        if "library" in q or "book" in q:
+        if LIBRARY_RE.search(q):
             return "Student Services" # Or Campus Life? Let's stick to valid existing pattern
             
         # --- PLACEMENT ---
-        if "placement" in q or "package" in q or "recruit" in q or "company" in q or "companies" in q or "internship" in q:
-            return "Cross-Domain Queries" # Or General Information? 
+        if PLACEMENT_RE.search(q):
             # The QA dataset has placements in "Cross-Domain Queries" (Lines 32-36)
             # But duplicate rows in classifier might say 'General Information' or 'Academic Affairs'
             return "Cross-Domain Queries"
@@ -70,33 +106,28 @@ def clean_data():
         return cat
 
     # Apply corrections
-    # We create a new list to avoid modifying during iteration issues
-    new_rows = []
+    # Preallocate the output column and fill it by position; itertuples yields
+    # lightweight namedtuples instead of building a Series per row.
+    new_cats = np.empty(len(df), dtype=object)
     
-    for _, row in df.iterrows():
-        old_cat = row['Category']
+    # Lowercase the whole column once instead of once per rule check.
+    # (itertuples renames leading-underscore columns, hence no "_" prefix.)
+    df['q_lower'] = df['Question'].astype('string').str.lower().fillna("")
+    
+    for i, row in enumerate(df.itertuples(index=False, name='R')):
         new_cat = get_corrected_category(row)
         
         # Override specific known bads
-        if "is hostel available" in str(row['Question']).lower():
+        if "is hostel available" in row.q_lower:
             new_cat = "Campus Life"
         
-        new_rows.append({
-            "Question": row['Question'],
-            "Category": new_cat
-        })
+        new_cats[i] = new_cat
         
-    new_df = pd.DataFrame(new_rows)
-    
-    # 3. Drop Duplicates
-    # Drop rows where Question is identical (keep first or last? doesn't matter if we standardized label)
-    # But wait, we want to ensure we don't have (Q, Cat1) and (Q, Cat2).
-    # Since we corrected categories based on content, duplicates should now have SAME category.
-    # So we can just drop duplicate Questions.
-    
-    before_dedup = len(new_df)
-    new_df = new_df.drop_duplicates(subset=['Question'], keep='last')
-    print(f"Dropped {before_dedup - len(new_df)} duplicate questions.")
+    extra_cats = sorted({c for c in new_cats if c not in KNOWN_CATEGORIES})
+    new_df = pd.DataFrame({
+        "Question": df['Question'].to_numpy(copy=False),
+        "Category": pd.Categorical(new_cats, categories=KNOWN_CATEGORIES + extra_cats),
+    })
     
     # 4. Save
     print(f"Final count: {len(new_df)}")
@@ -10,24 +10,53 @@ Tests all system metrics:
 - End-to-end system performance
 
 Usage:
-    python scripts/evaluate_metrics.py
+    python scripts/evaluate_metrics.py [--verbose] [--no-cache] [--burst]
 """
 
-import json
+import argparse
+import asyncio
+import hashlib
+import importlib
+import os
 import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
-from sklearn.metrics import (accuracy_score, classification_report,
-                             confusion_matrix, f1_score,
-                             precision_recall_curve, precision_score,
-                             recall_score, roc_auc_score, roc_curve)
+import orjson
 
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from metrics_kernels import as_flags, as_samples, confusion_counts
+from parallel_runner import run_parallel
+
+def _dumps(obj, indent: bool = False) -> str:
+    """JSON-encode with orjson, which also handles NumPy values."""
+    option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(obj, option=option).decode("utf-8")
+
+@contextmanager
+def _scratch_query_stats():
+    """
+    Point StatsManager at a throwaway file for the duration, so the queries
+    the evaluation sends through handle_query() don't count as real usage
+    in data/query_stats.json.
+    """
+    import core.stats_manager as stats_manager
+    original = stats_manager.STATS_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        stats_manager.STATS_FILE = os.path.join(tmp, "query_stats.json")
+        try:
+            yield
+        finally:
+            stats_manager.STATS_FILE = original
+
 # ============================================================================
 # TEST DATASETS
 # ============================================================================
@@ -124,6 +153,19 @@ class TestDatasets:
         ("Tell me a joke", False),
     ]
 
+    # Classifier inputs vectorized once per run (see build_cached_features)
+    CLASSIFIER_TEST_FEATURES = None
+    CLASSIFIER_TEST_LABELS = np.array([label for _, label in CLASSIFIER_TEST_CASES])
+    
+    # Fixed subset used by the routing test
+    ROUTING_SAMPLE = tuple(CLASSIFIER_TEST_CASES[:15])
+    ROUTING_SAMPLE_QUERIES = [q for q, _ in ROUTING_SAMPLE]
+    
+    @classmethod
+    def build_cached_features(cls, vectorize) -> None:
+        """Vectorize the static classifier test queries once and keep the matrix."""
+        cls.CLASSIFIER_TEST_FEATURES = vectorize([q for q, _ in cls.CLASSIFIER_TEST_CASES])
+
 # ============================================================================
 # METRICS CALCULATION
 # ============================================================================
@@ -139,15 +181,57 @@ class MetricsCalculator:
     ) -> Dict:
         """Calculate classification metrics."""
         
+        # Build the confusion matrix once and derive every score from it
+        label_arr = np.asarray(labels)
+        order = np.argsort(label_arr)
+        true_idx = order[np.searchsorted(label_arr[order], y_true)]
+        pred_idx = order[np.searchsorted(label_arr[order], y_pred)]
+        cm = np.zeros((len(labels), len(labels)), dtype=np.int64)
+        np.add.at(cm, (true_idx, pred_idx), 1)
+        tp = np.diag(cm).astype(float)
+        predicted = cm.sum(axis=0)
+        support = cm.sum(axis=1)
+        total = support.sum()
+        
+        precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+        recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+        denom = precision + recall
+        f1 = np.divide(2 * precision * recall, denom, out=np.zeros_like(tp), where=denom > 0)
+        
+        def weighted(values):
+            return float((values * support).sum() / total) if total > 0 else 0.0
+        
         return {
-            "accuracy": float(accuracy_score(y_true, y_pred)),
-            "precision": float(precision_score(y_true, y_pred, average='weighted', zero_division=0)),
-            "recall": float(recall_score(y_true, y_pred, average='weighted', zero_division=0)),
-            "f1": float(f1_score(y_true, y_pred, average='weighted', zero_division=0)),
-            "classification_report": classification_report(y_true, y_pred, zero_division=0),
-            "confusion_matrix": confusion_matrix(y_true, y_pred, labels=labels).tolist()
+            "accuracy": float(tp.sum() / total) if total > 0 else 0.0,
+            "precision": weighted(precision),
+            "recall": weighted(recall),
+            "f1": weighted(f1),
+            "per_class": {
+                "labels": list(labels),
+                "precision": precision.tolist(),
+                "recall": recall.tolist(),
+                "f1": f1.tolist(),
+                "support": support.tolist(),
+            },
+            "confusion_matrix": cm.tolist()
         }
     
+    @staticmethod
+    def format_classification_report(metrics: Dict) -> str:
+        """Render the per-class numbers as a text table."""
+        per_class = metrics["per_class"]
+        width = max([len(label) for label in per_class["labels"]] + [len("weighted avg")])
+        lines = [f"{'':>{width}}  precision    recall  f1-score   support", ""]
+        for label, p, r, f, n in zip(per_class["labels"], per_class["precision"],
+                                     per_class["recall"], per_class["f1"], per_class["support"]):
+            lines.append(f"{label:>{width}}  {p:9.2f} {r:9.2f} {f:9.2f} {n:9d}")
+        lines.append("")
+        lines.append(
+            f"{'weighted avg':>{width}}  {metrics['precision']:9.2f} {metrics['recall']:9.2f} "
+            f"{metrics['f1']:9.2f} {sum(per_class['support']):9d}"
+        )
+        return "\n".join(lines)
+    
     @staticmethod
     def calculate_safety_metrics(
         y_true: List[bool],
@@ -158,10 +242,9 @@ class MetricsCalculator:
         # y_true: True if should block, False if should allow
         # y_pred: True if blocked, False if allowed
         
-        tp = sum((y_true[i] and y_pred[i]) for i in range(len(y_true)))  # Correctly blocked
-        tn = sum((not y_true[i] and not y_pred[i]) for i in range(len(y_true)))  # Correctly allowed
-        fp = sum((not y_true[i] and y_pred[i]) for i in range(len(y_true)))  # False positives
-        fn = sum((y_true[i] and not y_pred[i]) for i in range(len(y_true)))  # False negatives
+        # tp: correctly blocked, tn: correctly allowed,
+        # fp: false positives, fn: false negatives
+        tp, tn, fp, fn = (int(n) for n in confusion_counts(as_flags(y_true), as_flags(y_pred)))
         
         accuracy = (tp + tn) / len(y_true) if len(y_true) > 0 else 0
         precision = tp / (tp + fp) if (tp + fp) > 0 else 0
@@ -189,15 +272,19 @@ class MetricsCalculator:
         if total == 0:
             return {"error": "No data"}
         
-        # Analyze routing decisions
-        high_conf = sum(1 for c in classifications if c['confidence'] >= 0.75)
-        mid_conf = sum(1 for c in classifications if 0.45 <= c['confidence'] < 0.75)
-        low_conf = sum(1 for c in classifications if c['confidence'] < 0.45)
+        # Extract fields once, then bucket/count in NumPy instead of one
+        # Python pass per bucket
+        conf = np.fromiter((c['confidence'] for c in classifications), dtype=np.float64, count=total)
+        low_conf, mid_conf, high_conf = (
+            int(n) for n in np.bincount(np.digitize(conf, [0.45, 0.75]), minlength=3)
+        )
         
         # Routing to each bot
-        bot1_count = sum(1 for c in classifications if c['routed_to'] == 'BOT-1')
-        bot2_count = sum(1 for c in classifications if c['routed_to'] == 'BOT-2')
-        bot3_count = sum(1 for c in classifications if c['routed_to'] == 'BOT-3')
+        routes, route_counts = np.unique([c['routed_to'] for c in classifications], return_counts=True)
+        route_totals = dict(zip(routes.tolist(), route_counts.tolist()))
+        bot1_count = route_totals.get('BOT-1', 0)
+        bot2_count = route_totals.get('BOT-2', 0)
+        bot3_count = route_totals.get('BOT-3', 0)
         
         return {
             "total_queries": total,
@@ -222,18 +309,18 @@ class MetricsCalculator:
         if not retrievals:
             return {"error": "No retrieval data"}
         
-        similarities = [r.get('similarity', 0) for r in retrievals]
+        similarities = as_samples([r.get('similarity', 0) for r in retrievals])
         
         return {
-            "avg_similarity": float(np.mean(similarities)),
-            "max_similarity": float(np.max(similarities)) if similarities else 0,
-            "min_similarity": float(np.min(similarities)) if similarities else 0,
-            "std_similarity": float(np.std(similarities)),
+            "avg_similarity": float(similarities.mean()),
+            "max_similarity": float(similarities.max()),
+            "min_similarity": float(similarities.min()),
+            "std_similarity": float(similarities.std()),
             "similarity_distribution": {
-                "excellent (>=0.8)": sum(1 for s in similarities if s >= 0.8),
-                "good (0.65-0.8)": sum(1 for s in similarities if 0.65 <= s < 0.8),
-                "fair (0.45-0.65)": sum(1 for s in similarities if 0.45 <= s < 0.65),
-                "poor (<0.45)": sum(1 for s in similarities if s < 0.45),
+                "excellent (>=0.8)": int((similarities >= 0.8).sum()),
+                "good (0.65-0.8)": int(((similarities >= 0.65) & (similarities < 0.8)).sum()),
+                "fair (0.45-0.65)": int(((similarities >= 0.45) & (similarities < 0.65)).sum()),
+                "poor (<0.45)": int((similarities < 0.45).sum()),
             }
         }
 
@@ -244,11 +331,158 @@ class MetricsCalculator:
 class MetricsEvaluator:
     """Main evaluator class."""
     
-    def __init__(self):
+    def __init__(self, verbose: bool = False, use_cache: bool = True, run_burst: bool = False):
+        self.verbose = verbose
+        self.use_cache = use_cache
+        self.run_burst = run_burst
         self.results = {
             "timestamp": datetime.now().isoformat(),
-            "tests": {}
+            "tests": {},
+            "details_file": str(self.STREAM_FILE)
         }
+        self._results_lock = threading.Lock()
+        # Full per-test results are appended here as each test finishes, so a
+        # crash part-way through keeps everything recorded so far
+        self._stream = open(self.STREAM_FILE, "w", encoding="utf-8", buffering=1)
+        # query -> (category, confidence, probs), shared by the classifier and routing tests
+        self._predict_cache: Dict[str, Tuple] = {}
+        self._predict_lock = threading.Lock()
+        self._load_dependencies()
+    
+    # One JSON line per finished test
+    STREAM_FILE = Path("metrics_results.jsonl")
+    
+    # Stored results of deterministic tests, keyed by a hash of their inputs
+    CACHE_DIR = Path(".metrics_cache")
+    
+    # name -> module for every callable the tests use
+    DEPENDENCIES = {
+        "predict_category_batch": "classifier.classifier",
+        "vectorize_queries": "classifier.classifier",
+        "predict_category_features": "classifier.classifier",
+        "validate_query_batch": "services.query_validator",
+        "scope_check_batch": "services.scope_guard",
+        "get_rule_response": "bots.rule_bot",
+        "bot2_answer": "bots.bot2_semantic",
+        "bot3_answer": "bots.bot3_rag",
+        "handle_query": "main",
+        "handle_query_async": "main",
+    }
+    
+    # Timed runs per latency query (after one discarded warm-up run). Each
+    # one is a full pipeline call, Bot-3's LLM included, so keep it small.
+    LATENCY_REPEATS = 3
+    
+    # Copies of the latency queries kept in flight together for throughput
+    THROUGHPUT_MULTIPLIER = 10
+    
+    # Discarded calls that load models before any timed region
+    WARMUP_CALLS = {
+        "predict_category_batch": lambda fn: fn(["warm up"]),
+        "validate_query_batch": lambda fn: fn(["warm up"]),
+        "scope_check_batch": lambda fn: fn(["warm up"]),
+        "get_rule_response": lambda fn: fn("hello"),
+        "bot2_answer": lambda fn: fn("warm up", "warmup"),
+    }
+    
+    def _load_dependencies(self):
+        """
+        Import everything the tests call once, up front, and warm up the models.
+        Failures are kept and re-raised by _dep() inside the owning test.
+        """
+        self._deps = {}
+        cold_start_ms = {}
+        
+        for name, module_name in self.DEPENDENCIES.items():
+            start = time.perf_counter()
+            try:
+                fn = getattr(importlib.import_module(module_name), name)
+                warmup = self.WARMUP_CALLS.get(name)
+                if warmup:
+                    warmup(fn)
+                self._deps[name] = fn
+            except Exception as e:
+                self._deps[name] = e
+            cold_start_ms[name] = (time.perf_counter() - start) * 1000
+        
+        self.results["cold_start_ms"] = cold_start_ms
+        
+        # Static test queries only need tokenizing once
+        if not isinstance(self._deps["vectorize_queries"], Exception):
+            try:
+                TestDatasets.build_cached_features(self._deps["vectorize_queries"])
+            except Exception as e:
+                print(f"[WARNING] Could not pre-vectorize classifier test set: {e}")
+    
+    def _classify(self, queries: List[str]) -> Tuple[List[str], List[float], List[Dict]]:
+        """Batch-classify queries, reusing predictions made earlier in this run."""
+        with self._predict_lock:
+            missing = list(dict.fromkeys(q for q in queries if q not in self._predict_cache))
+            if missing:
+                predicted = self._dep("predict_category_batch")(missing)
+                self._predict_cache.update(zip(missing, zip(*predicted)))
+            hits = [self._predict_cache[q] for q in queries]
+        
+        categories, confidences, probs = (list(col) for col in zip(*hits)) if hits else ([], [], [])
+        return categories, confidences, probs
+    
+    def _dep(self, name: str):
+        """Return a preloaded callable, raising its import/warm-up error if any."""
+        dep = self._deps[name]
+        if isinstance(dep, Exception):
+            raise dep
+        return dep
+    
+    def _record(self, name: str, value: Dict):
+        """
+        Append one test's full results to the JSONL stream and keep only its
+        status in self.results (safe to call from worker threads).
+        """
+        line = _dumps({"test": name, **value})
+        with self._results_lock:
+            self._stream.write(line + "\n")
+            self.results["tests"][name] = {"status": value.get("status", "DONE")}
+    
+    @staticmethod
+    def _cache_key(test_cases, *artifacts: str) -> Optional[str]:
+        """
+        Hash of the files a test exercises plus the test cases it runs, or
+        None (never cached) if any of those files is missing.
+        """
+        digest = hashlib.blake2b(repr(test_cases).encode("utf-8"))
+        for artifact in artifacts:
+            path = project_root / artifact
+            if not path.is_file():
+                return None
+            digest.update(artifact.encode("utf-8"))
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+    
+    def _load_cached(self, name: str, key: str):
+        """
+        If this test already ran against identical inputs, re-record its stored
+        results and return its pass/fail value; otherwise return None.
+        """
+        if key is None or not self.use_cache:
+            return None
+        path = self.CACHE_DIR / f"{key}.json"
+        if not path.exists():
+            return None
+        entry = orjson.loads(path.read_bytes())
+        print("[CACHED] Inputs unchanged since last run, reusing stored results")
+        self._record(name, entry["result"])
+        return entry["passed"]
+    
+    def _record_cached(self, name: str, key: str, result: Dict, passed: bool) -> bool:
+        """_record() plus a cache entry for _load_cached(); returns `passed`."""
+        self._record(name, result)
+        if key is None:
+            return passed
+        self.CACHE_DIR.mkdir(exist_ok=True)
+        (self.CACHE_DIR / f"{key}.json").write_text(
+            _dumps({"passed": passed, "result": result}), encoding="utf-8"
+        )
+        return passed
     
     def test_classifier_metrics(self):
         """Test classifier accuracy, precision, recall, F1."""
@@ -257,15 +491,21 @@ class MetricsEvaluator:
         print("="*70)
         
         try:
-            from classifier.classifier import predict_category
-            
-            y_true = []
-            y_pred = []
-            
-            for query, expected_category in TestDatasets.CLASSIFIER_TEST_CASES:
-                predicted_category, confidence, probs = predict_category(query)
-                y_true.append(expected_category)
-                y_pred.append(predicted_category)
+            cache_key = self._cache_key(
+                TestDatasets.CLASSIFIER_TEST_CASES, "classifier/classifier.pkl", "classifier/classifier.py"
+            )
+            cached = self._load_cached("classifier_metrics", cache_key)
+            if cached is not None:
+                return cached
+            
+            queries = [q for q, _ in TestDatasets.CLASSIFIER_TEST_CASES]
+            y_true = TestDatasets.CLASSIFIER_TEST_LABELS.tolist()
+            
+            if TestDatasets.CLASSIFIER_TEST_FEATURES is not None:
+                predicted = self._dep("predict_category_features")(TestDatasets.CLASSIFIER_TEST_FEATURES)
+                with self._predict_lock:
+                    self._predict_cache.update(zip(queries, zip(*predicted)))
+            y_pred, confidences, probs = self._classify(queries)
             
             # Get unique labels
             labels = list(set(y_true + y_pred))
@@ -278,19 +518,18 @@ class MetricsEvaluator:
             print(f"[OK] Precision: {metrics['precision']:.4f}")
             print(f"[OK] Recall:    {metrics['recall']:.4f}")
             print(f"[OK] F1-Score:  {metrics['f1']:.4f}")
-            print(f"\nClassification Report:")
-            print(metrics['classification_report'])
+            if self.verbose:
+                print(f"\nClassification Report:")
+                print(MetricsCalculator.format_classification_report(metrics))
             
-            self.results["tests"]["classifier_metrics"] = {
+            return self._record_cached("classifier_metrics", cache_key, {
                 "status": "PASS" if metrics['accuracy'] >= 0.70 else "WARN",
                 "metrics": metrics
-            }
-            
-            return True
+            }, passed=True)
         
         except Exception as e:
             print(f"[ERROR] Error: {e}")
-            self.results["tests"]["classifier_metrics"] = {"status": "FAIL", "error": str(e)}
+            self._record("classifier_metrics", {"status": "FAIL", "error": str(e)})
             return False
     
     def test_safety_mechanisms(self):
@@ -300,17 +539,17 @@ class MetricsEvaluator:
         print("="*70)
         
         try:
-            from services.query_validator import validate_query
+            cache_key = self._cache_key(
+                TestDatasets.SAFETY_TEST_CASES, "services/query_validator.py", "services/_regex_util.py"
+            )
+            cached = self._load_cached("safety_metrics", cache_key)
+            if cached is not None:
+                return cached
             
-            y_true = []  # True if should block
-            y_pred = []  # True if blocked
+            validate_query_batch = self._dep("validate_query_batch")
             
-            for query, should_block in TestDatasets.SAFETY_TEST_CASES:
-                is_valid, reason = validate_query(query)
-                is_blocked = not is_valid
-                
-                y_true.append(should_block)
-                y_pred.append(is_blocked)
+            queries, y_true = map(list, zip(*TestDatasets.SAFETY_TEST_CASES))  # True if should block
+            y_pred = [not is_valid for is_valid, reason in validate_query_batch(queries)]  # True if blocked
             
             # Calculate metrics
             metrics = MetricsCalculator.calculate_safety_metrics(y_true, y_pred)
@@ -331,16 +570,14 @@ class MetricsEvaluator:
             else:
                 print(f"\n[ALERT] WARNING: {metrics['false_negatives']} dangerous queries were allowed!")
             
-            self.results["tests"]["safety_metrics"] = {
+            return self._record_cached("safety_metrics", cache_key, {
                 "status": "PASS" if metrics['false_negatives'] == 0 else "FAIL",
                 "metrics": metrics
-            }
-            
-            return metrics['false_negatives'] == 0
+            }, passed=metrics['false_negatives'] == 0)
         
         except Exception as e:
             print(f"[ERROR] Error: {e}")
-            self.results["tests"]["safety_metrics"] = {"status": "FAIL", "error": str(e)}
+            self._record("safety_metrics", {"status": "FAIL", "error": str(e)})
             return False
     
     def test_scope_guard(self):
@@ -350,36 +587,37 @@ class MetricsEvaluator:
         print("="*70)
         
         try:
-            from services.scope_guard import scope_check
+            cache_key = self._cache_key(
+                TestDatasets.SCOPE_TEST_CASES, "services/scope_guard.py", "services/_regex_util.py"
+            )
+            cached = self._load_cached("scope_metrics", cache_key)
+            if cached is not None:
+                return cached
             
-            y_true = []  # True if should be in scope
-            y_pred = []  # True if detected as in scope
+            scope_check_batch = self._dep("scope_check_batch")
             
-            for query, should_be_in_scope in TestDatasets.SCOPE_TEST_CASES:
-                in_scope, reason = scope_check(query)
-                
-                y_true.append(should_be_in_scope)
-                y_pred.append(in_scope)
+            queries, y_true = map(list, zip(*TestDatasets.SCOPE_TEST_CASES))  # True if should be in scope
+            y_pred = [in_scope for in_scope, reason in scope_check_batch(queries)]  # True if detected as in scope
             
             # Simple accuracy
-            correct = sum(y_true[i] == y_pred[i] for i in range(len(y_true)))
-            accuracy = correct / len(y_true)
+            yt = np.fromiter(y_true, dtype=bool, count=len(y_true))
+            yp = np.fromiter(y_pred, dtype=bool, count=len(y_pred))
+            correct = int((yt == yp).sum())
+            accuracy = correct / yt.size
             
             print(f"[OK] Accuracy: {accuracy:.4f} ({accuracy*100:.2f}%)")
             print(f"[OK] Correct detections: {correct}/{len(y_true)}")
             
-            self.results["tests"]["scope_metrics"] = {
+            return self._record_cached("scope_metrics", cache_key, {
                 "status": "PASS" if accuracy >= 0.90 else "WARN",
                 "accuracy": float(accuracy),
                 "correct": correct,
                 "total": len(y_true)
-            }
-            
-            return True
+            }, passed=True)
         
         except Exception as e:
             print(f"[ERROR] Error: {e}")
-            self.results["tests"]["scope_metrics"] = {"status": "FAIL", "error": str(e)}
+            self._record("scope_metrics", {"status": "FAIL", "error": str(e)})
             return False
     
     def test_bot_performance(self):
@@ -393,7 +631,7 @@ class MetricsEvaluator:
         # Bot-1 (Rule-based)
         print("\n[BOT-1] Bot-1 (Rule-Based AIML):")
         try:
-            from bots.rule_bot import get_rule_response
+            get_rule_response = self._dep("get_rule_response")
             
             test_queries = [
                 "What are the admission requirements?",
@@ -401,16 +639,21 @@ class MetricsEvaluator:
                 "What is the campus location?",
             ]
             
-            responses = []
-            for query in test_queries:
-                response = get_rule_response(query)
-                responses.append(len(response) > 0 and "don't have information" not in response.lower())
-            
-            success_rate = sum(responses) / len(responses)
+            responses = np.fromiter(
+                (
+                    len(response) > 0 and "don't have information" not in response.lower()
+                    for response in map(get_rule_response, test_queries)
+                ),
+                dtype=bool,
+                count=len(test_queries),
+            )
+            handled = int(responses.sum())
+            
+            success_rate = handled / responses.size
             print(f"  [OK] Success Rate: {success_rate:.4f} ({success_rate*100:.2f}%)")
-            print(f"  [OK] Queries Handled: {sum(responses)}/{len(responses)}")
+            print(f"  [OK] Queries Handled: {handled}/{responses.size}")
             
-            results["BOT-1"] = {"success_rate": float(success_rate), "handled": sum(responses), "total": len(responses)}
+            results["BOT-1"] = {"success_rate": float(success_rate), "handled": handled, "total": int(responses.size)}
         
         except Exception as e:
             print(f"  [ERROR] Error: {e}")
@@ -419,7 +662,7 @@ class MetricsEvaluator:
         # Bot-2 (Semantic)
         print("\n[BOT-2] Bot-2 (Semantic QA):")
         try:
-            from bots.bot2_semantic import bot2_answer
+            bot2_answer = self._dep("bot2_answer")
             
             test_queries = [
                 "What is the hostel fee?",
@@ -427,16 +670,14 @@ class MetricsEvaluator:
                 "Tell me about the engineering program",
             ]
             
-            similarities = []
-            confident_count = 0
+            similarities = np.empty(len(test_queries), dtype=np.float64)
+            confident = np.empty(len(test_queries), dtype=bool)
             
-            for query in test_queries:
-                answer, similarity, is_confident = bot2_answer(query, "test")
-                similarities.append(similarity)
-                if is_confident:
-                    confident_count += 1
+            for i, query in enumerate(test_queries):
+                answer, similarities[i], confident[i] = bot2_answer(query, "test")
             
-            avg_similarity = np.mean(similarities)
+            avg_similarity = similarities.mean()
+            confident_count = int(confident.sum())
             confidence_rate = confident_count / len(test_queries)
             
             print(f"  [OK] Avg Similarity: {avg_similarity:.4f}")
@@ -456,7 +697,7 @@ class MetricsEvaluator:
         # Bot-3 (RAG)
         print("\n[BOT-3] Bot-3 (RAG):")
         try:
-            from bots.bot3_rag import bot3_answer
+            bot3_answer = self._dep("bot3_answer")
             
             test_queries = [
                 "Tell me about the CSE program",
@@ -464,26 +705,27 @@ class MetricsEvaluator:
                 "What is the campus about?",
             ]
             
-            response_lengths = []
-            for query in test_queries:
-                response = bot3_answer(query, [], "test")
-                response_lengths.append(len(response))
+            response_lengths = np.empty(len(test_queries), dtype=np.float64)
+            for i, query in enumerate(test_queries):
+                response_lengths[i] = len(bot3_answer(query, [], "test"))
             
-            avg_response_length = np.mean(response_lengths)
+            avg_response_length = response_lengths.mean()
+            min_length = int(response_lengths.min())
+            max_length = int(response_lengths.max())
             print(f"  [OK] Avg Response Length: {avg_response_length:.0f} characters")
-            print(f"  [OK] Min Response: {min(response_lengths)}, Max Response: {max(response_lengths)}")
+            print(f"  [OK] Min Response: {min_length}, Max Response: {max_length}")
             
             results["BOT-3"] = {
                 "avg_response_length": float(avg_response_length),
-                "min_length": min(response_lengths),
-                "max_length": max(response_lengths)
+                "min_length": min_length,
+                "max_length": max_length
             }
         
         except Exception as e:
             print(f"  [ERROR] Error: {e}")
             results["BOT-3"] = {"status": "ERROR", "error": str(e)}
         
-        self.results["tests"]["bot_metrics"] = results
+        self._record("bot_metrics", results)
         return True
     
     def test_routing_effectiveness(self):
@@ -493,32 +735,33 @@ class MetricsEvaluator:
         print("="*70)
         
         try:
-            from classifier.classifier import predict_category
-            
-            classifications = []
-            
-            test_queries = TestDatasets.CLASSIFIER_TEST_CASES[:15]  # Sample
-            
-            for query, expected_category in test_queries:
-                category, confidence, probs = predict_category(query)
-                
-                # Simulate routing
-                if confidence < 0.45:
-                    routed_to = "BOT-3"
-                elif category in ["Admissions & Registrations", "Financial Matters"]:
-                    routed_to = "BOT-1"
-                elif category in ["Academic Affairs", "Student Services", "Campus Life"]:
-                    routed_to = "BOT-2"
-                else:
-                    routed_to = "BOT-3"
-                
-                classifications.append({
+            test_queries = TestDatasets.ROUTING_SAMPLE
+            categories, confidences, _ = self._classify(TestDatasets.ROUTING_SAMPLE_QUERIES)
+            
+            # Simulate routing for the whole sample at once
+            cats = np.asarray(categories, dtype=object)
+            confs = np.asarray(confidences, dtype=np.float64)
+            routed = np.select(
+                [
+                    confs < 0.45,
+                    np.isin(cats, ["Admissions & Registrations", "Financial Matters"]),
+                    np.isin(cats, ["Academic Affairs", "Student Services", "Campus Life"]),
+                ],
+                ["BOT-3", "BOT-1", "BOT-2"],
+                default="BOT-3",
+            )
+            
+            classifications = [
+                {
                     "query": query,
                     "expected": expected_category,
                     "predicted": category,
                     "confidence": confidence,
                     "routed_to": routed_to
-                })
+                }
+                for (query, expected_category), category, confidence, routed_to
+                in zip(test_queries, categories, confidences, routed.tolist())
+            ]
             
             # Calculate metrics
             metrics = MetricsCalculator.calculate_routing_metrics(classifications)
@@ -531,16 +774,16 @@ class MetricsEvaluator:
             for bot, data in metrics['routing_distribution'].items():
                 print(f"  {bot}: {data['count']} ({data['percentage']:.1f}%)")
             
-            self.results["tests"]["routing_metrics"] = {
+            self._record("routing_metrics", {
                 "status": "PASS",
                 "metrics": metrics
-            }
+            })
             
             return True
         
         except Exception as e:
             print(f"[ERROR] Error: {e}")
-            self.results["tests"]["routing_metrics"] = {"status": "FAIL", "error": str(e)}
+            self._record("routing_metrics", {"status": "FAIL", "error": str(e)})
             return False
     
     def test_system_latency(self):
@@ -550,9 +793,7 @@ class MetricsEvaluator:
         print("="*70)
         
         try:
-            import time
-
-            from main import handle_query
+            handle_query = self._dep("handle_query")
             
             test_queries = [
                 "What is the hostel fee?",
@@ -560,37 +801,74 @@ class MetricsEvaluator:
                 "Tell me about CSE",
             ]
             
-            latencies = []
-            
-            for query in test_queries:
-                start = time.time()
-                response = handle_query(query, [])
-                elapsed = (time.time() - start) * 1000  # ms
-                latencies.append(elapsed)
-                print(f"  Query: '{query[:30]}...' → {elapsed:.1f}ms")
-            
-            avg_latency = np.mean(latencies)
-            max_latency = np.max(latencies)
-            min_latency = np.min(latencies)
+            # One row of timed repeats per query, allocated up front
+            samples = np.empty((len(test_queries), self.LATENCY_REPEATS), dtype=np.float64)
+            
+            # The calls wait on the LLM and network, so the collector stays on:
+            # disabling it would only grow memory, not steady the timings
+            with _scratch_query_stats():
+                for i, query in enumerate(test_queries):
+                    handle_query(query, [])  # warm-up, discarded
+                    row = samples[i]
+                    for r in range(self.LATENCY_REPEATS):
+                        start = time.perf_counter_ns()
+                        response = handle_query(query, [])
+                        row[r] = (time.perf_counter_ns() - start) / 1e6  # ms
+                    print(f"  Query: '{query[:30]}...' → p50 {np.median(row):.1f}ms over {row.size} runs")
+            
+            latencies = samples.ravel()
+            avg_latency = latencies.mean()
+            max_latency = latencies.max()
+            min_latency = latencies.min()
+            p25, p50, p75, p95 = np.percentile(latencies, [25, 50, 75, 95])
+            
+            throughput = {}
+            if self.run_burst:
+                # Concurrent throughput: sequential timings above miss how requests
+                # overlap in production, so also push a burst through at once.
+                # Opt-in (--burst): these are real end-to-end calls, LLM included.
+                handle_query_async = self._dep("handle_query_async")
+                burst = test_queries * self.THROUGHPUT_MULTIPLIER
+                
+                async def run_burst():
+                    return await asyncio.gather(*(handle_query_async(q, []) for q in burst))
+                
+                with _scratch_query_stats():
+                    start = time.perf_counter()
+                    asyncio.run(run_burst())
+                    burst_seconds = time.perf_counter() - start
+                throughput = {
+                    "throughput_qps": len(burst) / burst_seconds,
+                    "concurrent_queries": len(burst),
+                }
             
             print(f"\n[STATS] Latency Metrics:")
             print(f"  Average: {avg_latency:.1f}ms")
+            print(f"  p50: {p50:.1f}ms  p95: {p95:.1f}ms  IQR: {p75 - p25:.1f}ms")
             print(f"  Min: {min_latency:.1f}ms")
             print(f"  Max: {max_latency:.1f}ms")
+            if throughput:
+                print(f"  Throughput: {throughput['throughput_qps']:.1f} queries/s "
+                      f"({throughput['concurrent_queries']} concurrent in {burst_seconds:.2f}s)")
             print(f"  Status: {'[FAST]' if avg_latency < 500 else '[SLOW]' if avg_latency < 1000 else '[TOO SLOW]'}")
             
-            self.results["tests"]["latency_metrics"] = {
+            self._record("latency_metrics", {
                 "status": "PASS" if avg_latency < 1000 else "WARN",
                 "average_ms": float(avg_latency),
                 "min_ms": float(min_latency),
-                "max_ms": float(max_latency)
-            }
+                "max_ms": float(max_latency),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "iqr_ms": float(p75 - p25),
+                "repeats": self.LATENCY_REPEATS,
+                **throughput
+            })
             
             return True
         
         except Exception as e:
             print(f"[ERROR] Error: {e}")
-            self.results["tests"]["latency_metrics"] = {"status": "FAIL", "error": str(e)}
+            self._record("latency_metrics", {"status": "FAIL", "error": str(e)})
             return False
     
     def run_all_tests(self):
@@ -599,14 +877,19 @@ class MetricsEvaluator:
         print("COMPREHENSIVE METRICS EVALUATION SUITE")
         print("="*70)
         
-        results = [
-            self.test_classifier_metrics(),
-            self.test_safety_mechanisms(),
-            self.test_scope_guard(),
-            self.test_bot_performance(),
-            self.test_routing_effectiveness(),
-            self.test_system_latency(),
+        # The first five tests touch independent modules, so run them
+        # concurrently. Each test's output is buffered and printed in order.
+        parallel_tests = [
+            self.test_classifier_metrics,
+            self.test_safety_mechanisms,
+            self.test_scope_guard,
+            self.test_bot_performance,
+            self.test_routing_effectiveness,
         ]
+        results = run_parallel(parallel_tests)
+        
+        # Latency runs alone so the other tests don't skew its timings
+        results.append(self.test_system_latency())
         
         # Summary
         self.print_summary(results)
@@ -643,12 +926,12 @@ class MetricsEvaluator:
         self.save_results()
     
     def save_results(self):
-        """Save results to JSON file."""
+        """Write the run summary; per-test details are already in STREAM_FILE."""
         try:
+            self._stream.close()
             output_file = Path("metrics_results.json")
-            with open(output_file, "w") as f:
-                json.dump(self.results, f, indent=2)
-            print(f"\n[SAVED] Results saved to {output_file}")
+            output_file.write_text(_dumps(self.results, indent=True), encoding="utf-8")
+            print(f"\n[SAVED] Summary saved to {output_file}, details in {self.STREAM_FILE}")
         except Exception as e:
             print(f"[ERROR] Error saving results: {e}")
 
@@ -658,7 +941,14 @@ class MetricsEvaluator:
 
 def main():
     """Run metrics evaluation."""
-    evaluator = MetricsEvaluator()
+    parser = argparse.ArgumentParser(description="Run the metrics evaluation suite.")
+    parser.add_argument("--verbose", action="store_true", help="Print the per-class classification report")
+    parser.add_argument("--no-cache", action="store_true", help="Re-run every test even if its inputs are unchanged")
+    parser.add_argument("--burst", action="store_true",
+                        help="Also measure throughput with a concurrent burst of live queries (calls the LLM)")
+    args = parser.parse_args()
+    
+    evaluator = MetricsEvaluator(verbose=args.verbose, use_cache=not args.no_cache, run_burst=args.burst)
     results = evaluator.run_all_tests()
     
     # Exit code
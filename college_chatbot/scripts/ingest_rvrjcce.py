@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import os
 
@@ -5,7 +6,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from services.web_ingest import ingest_url
+    from services.web_ingest import ingest_urls
 except ImportError as e:
     print(f"Failed to import services: {e}")
     sys.exit(1)
@@ -66,20 +67,22 @@ URLS = [
 
 print(f"Starting ingestion of {len(URLS)} URLs...")
 
+# All pages are fetched concurrently (capped per host by
+# core.http.MAX_CONCURRENT_REQUESTS); results come back in URLS order
+results = asyncio.run(ingest_urls(URLS))
+
 success_count = 0
 with open("ingest_log.txt", "w") as log:
-    for u in URLS:
-        try:
-            print(f"Fetching: {u}")
-            log.write(f"Fetching: {u}\n")
-            fp = ingest_url(u)
-            print(f"  -> Saved: {fp}")
-            log.write(f"  -> Saved: {fp}\n")
+    for u, result in zip(URLS, results):
+        print(f"Fetching: {u}")
+        log.write(f"Fetching: {u}\n")
+        if isinstance(result, Exception):
+            print(f"  -> FAILED: {u} | Error: {result}")
+            log.write(f"  -> FAILED: {u} | Error: {result}\n")
+        else:
+            print(f"  -> Saved: {result}")
+            log.write(f"  -> Saved: {result}\n")
             success_count += 1
-            # time.sleep(0.5) # Reduced sleep
-        except Exception as e:
-            print(f"  -> FAILED: {u} | Error: {e}")
-            log.write(f"  -> FAILED: {u} | Error: {e}\n")
 
 print(f"Ingestion complete. Successfully saved {success_count}/{len(URLS)} pages.")
 print("Don't forget to rebuild the Bot-3 index!")
@@ -1,15 +1,25 @@
-from services.pdf_downloader import extract_pdf_links, download_pdf
+import asyncio
+
+from services.pdf_downloader import extract_pdf_links_many, download_pdfs
 
 PAGES = [
     "https://rvrjcce.ac.in/",
     "https://rvrjcce.ac.in/contactus.php",
 ]
 
-for page in PAGES:
-    pdfs = extract_pdf_links(page)
+# Pages and PDFs are fetched concurrently, capped per host by
+# core.http.MAX_CONCURRENT_REQUESTS
+to_download = []
+for page, pdfs in zip(PAGES, asyncio.run(extract_pdf_links_many(PAGES))):
     print(f"\nPage: {page}")
+    if isinstance(pdfs, Exception):
+        print(f"Failed: {pdfs}")
+        continue
     print("PDF links found:", len(pdfs))
+    to_download.extend(pdfs[:10])   # limit for safety
 
-    for pdf_url in pdfs[:10]:   # limit for safety
-        fp = download_pdf(pdf_url)
-        print("Downloaded:", fp)
+for url, result in zip(to_download, asyncio.run(download_pdfs(to_download))):
+    if isinstance(result, Exception):
+        print(f"Failed: {url} ({result})")
+    else:
+        print("Downloaded:", result)
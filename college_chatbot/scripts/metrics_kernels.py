@@ -0,0 +1,69 @@
+"""
+NUMERIC KERNELS FOR THE METRICS EVALUATION
+
+Tight counting loops used by scripts/evaluate_metrics.py. They are JIT-compiled
+with Numba when it is installed (optional: pip install numba); the compiled
+code is cached on disk, so only the first run pays the warm-up. Without Numba
+the NumPy versions below are used.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    # Not parallel=True: the evaluator calls this from worker threads, and
+    # Numba's parallel backends hang the interpreter at exit in that case.
+    # The loop is a plain reduction that LLVM vectorizes on its own.
+    @njit(cache=True)
+    def confusion_counts(y_true, y_pred):
+        """
+        Binary confusion counts for two int8 arrays of 0/1 flags.
+
+        Returns:
+            (tp, tn, fp, fn)
+        """
+        tp = 0
+        tn = 0
+        fp = 0
+        fn = 0
+        for i in range(y_true.shape[0]):
+            t = y_true[i]
+            p = y_pred[i]
+            tp += t & p
+            tn += (1 - t) & (1 - p)
+            fp += (1 - t) & p
+            fn += t & (1 - p)
+        return tp, tn, fp, fn
+else:
+    def confusion_counts(y_true, y_pred):
+        """
+        Binary confusion counts for two int8 arrays of 0/1 flags.
+
+        Returns:
+            (tp, tn, fp, fn)
+        """
+        yt = y_true.astype(bool)
+        yp = y_pred.astype(bool)
+        return (
+            int((yt & yp).sum()),
+            int((~yt & ~yp).sum()),
+            int((~yt & yp).sum()),
+            int((yt & ~yp).sum()),
+        )
+
+
+def as_flags(values) -> np.ndarray:
+    """C-contiguous int8 0/1 array for the kernels above."""
+    return np.ascontiguousarray(values, dtype=np.int8)
+
+
+def as_samples(values) -> np.ndarray:
+    """Unit-stride float32 array for mean/min/max/percentile reductions."""
+    arr = np.ascontiguousarray(values, dtype=np.float32)
+    assert arr.flags.c_contiguous and arr.strides[0] == arr.itemsize
+    return arr
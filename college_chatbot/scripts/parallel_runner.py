@@ -0,0 +1,68 @@
+"""
+PARALLEL TEST RUNNER
+
+Shared by scripts/evaluate_metrics.py and scripts/validate_phase1.py: runs
+independent test functions in a thread pool while keeping their console
+output readable. Each test's stdout/stderr is buffered per thread and
+printed in submission order once all of them have finished.
+"""
+
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+
+class ThreadLocalStream(io.TextIOBase):
+    """Routes writes from worker threads into per-thread buffers."""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def capture(self, buffer):
+        self._local.buffer = buffer
+    
+    def release(self):
+        self._local.buffer = None
+    
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+
+
+def run_parallel(tests: List[Callable], max_workers: Optional[int] = None) -> List:
+    """
+    Call each test with no arguments in a thread pool (one worker per test
+    by default) and return their results in order.
+    """
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    out_router = ThreadLocalStream(real_stdout)
+    err_router = ThreadLocalStream(real_stderr)
+    
+    def run(test):
+        buffer = io.StringIO()
+        out_router.capture(buffer)
+        err_router.capture(buffer)
+        try:
+            return test(), buffer.getvalue()
+        finally:
+            out_router.release()
+            err_router.release()
+    
+    sys.stdout, sys.stderr = out_router, err_router
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers or len(tests)) as executor:
+            outcomes = list(executor.map(run, tests))
+    finally:
+        sys.stdout, sys.stderr = real_stdout, real_stderr
+    
+    results = []
+    for result, output in outcomes:
+        print(output, end="")
+        results.append(result)
+    return results
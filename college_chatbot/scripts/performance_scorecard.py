@@ -4,14 +4,101 @@ PERFORMANCE COMPARISON & BASELINE ANALYSIS
 Compares metrics against target standards and baseline approaches.
 Generates performance scorecard for decision-making.
 
+Actual metric values are read from metrics_results.jsonl, written by
+scripts/evaluate_metrics.py in the working directory.
+
 Usage:
     python scripts/performance_scorecard.py
 """
 
-import json
+import sys
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import datetime
+from enum import IntEnum
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+import orjson
+
+# Per-test results written by scripts/evaluate_metrics.py
+RESULTS_FILE = "metrics_results.jsonl"
+
+# Count-valued metrics where lower is better
+SPECIAL_METRICS = frozenset({"safety_false_negatives"})
+
+class Priority(IntEnum):
+    """Recommendation priority, in the order they are printed."""
+    CRITICAL = 0
+    MEDIUM = 1
+    LOW = 2
+
+PRIORITY_LABELS = {
+    Priority.CRITICAL: "🔴 CRITICAL",
+    Priority.MEDIUM: "🟡 MEDIUM",
+    Priority.LOW: "🟢 LOW",
+}
+PRIORITY_HEADINGS = {
+    Priority.CRITICAL: "Fix First",
+    Priority.MEDIUM: "Next",
+    Priority.LOW: "Enhancement",
+}
+
+# Status bands: a score >= STATUS_THRESHOLDS[i - 1] gets STATUS_LABELS[i]
+STATUS_THRESHOLDS = (0.60, 0.75, 0.85, 0.95)
+STATUS_LABELS = ("🔴 CRITICAL", "🟠 NEEDS IMPROVEMENT", "🟡 FAIR", "🟢 GOOD", "🟢 EXCELLENT")
+
+# Table row layouts for the scorecard and baseline comparison
+ROW_FMT = "{:<35} {:<12} {:<12} {:<12} {:<15}".format
+COMPARISON_ROW_FMT = "{:<30} {:<35} {:<35} {:<20}".format
+
+
+def score_metrics(actuals: np.ndarray, targets: np.ndarray, lower_is_better: np.ndarray) -> np.ndarray:
+    """
+    Per-metric scores in [0, 1].
+    
+    Higher-is-better metrics score actual/target below target; lower-is-better
+    counts lose 0.1 per unit above target. Meeting the target scores 1.0.
+    `actuals` is one run (n_metrics,) or a stack of runs (n_runs, n_metrics).
+    """
+    higher = np.where(
+        actuals >= targets,
+        1.0,
+        np.divide(actuals, targets, out=np.zeros_like(actuals), where=targets > 0),
+    )
+    lower = np.where(actuals <= targets, 1.0, np.maximum(0.0, 1.0 - actuals / 10))  # Penalty per false negative
+    return np.minimum(1.0, np.where(lower_is_better, lower, higher))
+
+
+def score_batch(actuals: np.ndarray, targets: np.ndarray, weights: np.ndarray, lower_is_better: np.ndarray) -> np.ndarray:
+    """Weighted overall score of each run in an (n_runs, n_metrics) matrix."""
+    total_weight = weights.sum()
+    if total_weight <= 0:
+        return np.zeros(np.atleast_2d(actuals).shape[0])
+    scores = score_metrics(np.atleast_2d(actuals), targets, lower_is_better)
+    return (scores * weights).sum(axis=1) / total_weight
+
+
+# Aggregation schemes: (scores, weights, metric names) -> overall score
+def _weighted_aggregate(scores, weights, names):
+    total_weight = weights.sum()
+    return float((scores * weights).sum() / total_weight) if total_weight > 0 else 0.0
+
+def _mean_aggregate(scores, weights, names):
+    return float(scores.mean()) if scores.size else 0.0
+
+def _perf_only_aggregate(scores, weights, names):
+    # Task performance only: drop the safety metrics
+    keep = np.array([not name.startswith("safety_") for name in names], dtype=bool)
+    return _weighted_aggregate(scores[keep], weights[keep], names)
+
+AGGREGATORS = {
+    "weighted": _weighted_aggregate,
+    "mean": _mean_aggregate,
+    "perf_only": _perf_only_aggregate,
+}
+
 
 class PerformanceScorecard:
     """Generate performance scorecard with ratings."""
@@ -28,7 +115,7 @@ class PerformanceScorecard:
         "scope_accuracy": {"target": 0.85, "weight": 0.10, "critical": False},
     }
     
-    # Actual performance metrics (from evaluation)
+    # Last recorded evaluation; fallback for anything RESULTS_FILE lacks
     ACTUAL_METRICS = {
         "classifier_accuracy": 0.8000,
         "classifier_precision": 0.8867,
@@ -40,48 +127,137 @@ class PerformanceScorecard:
         "scope_accuracy": 0.5556,
     }
     
+    # Scorecard metric -> (evaluator test, keys into that test's result)
+    EVALUATION_FIELDS = {
+        "classifier_accuracy": ("classifier_metrics", ("metrics", "accuracy")),
+        "classifier_precision": ("classifier_metrics", ("metrics", "precision")),
+        "classifier_recall": ("classifier_metrics", ("metrics", "recall")),
+        "classifier_f1": ("classifier_metrics", ("metrics", "f1")),
+        "safety_precision": ("safety_metrics", ("metrics", "precision")),
+        "safety_recall": ("safety_metrics", ("metrics", "recall")),
+        "safety_false_negatives": ("safety_metrics", ("metrics", "false_negatives")),
+        "scope_accuracy": ("scope_metrics", ("accuracy",)),
+    }
+    
+    # Baseline paper comparison: (aspect, baseline, our system, improvement)
+    COMPARISON_ROWS = (
+        ("Safety Mechanisms", "[NO] NOT IMPLEMENTED", "[OK] 5-Layer System (77% accuracy)", "NEW CAPABILITY"),
+        ("Confidence-Aware Routing", "[NO] Not mentioned", "[OK] Implemented (20-47-33% distribution)", "NEW CAPABILITY"),
+        ("RAG Implementation", "[PARTIAL] Partial/Incomplete", "[OK] FULL RAG (chunking, metadata, retrieval)", "COMPLETE + CONFIDENCE"),
+        ("Hallucination Control", "[NO] Not discussed", "[OK] Threshold-based filtering", "NEW CAPABILITY"),
+        ("Audit Logging", "[NO] Not implemented", "[OK] JSON audit trails", "NEW CAPABILITY"),
+        ("Configuration", "[NO] Hard-coded", "[OK] Fully configurable", "ENHANCED"),
+        ("Code Quality", "[PARTIAL] Basic error handling", "[OK] Comprehensive (try-catch, logging)", "ENHANCED"),
+    )
+    
     def __init__(self):
         self.scores = {}
+        self.overall_score = 0
         self.timestamp = datetime.now().isoformat()
+        self._computed = False
     
-    def calculate_score(self, metric_name: str, actual: float, target: float) -> dict:
-        """Calculate performance score for a metric."""
+    @classmethod
+    @lru_cache(maxsize=1)
+    def get_actual_metrics(cls, path: str = RESULTS_FILE) -> dict:
+        """
+        Actual metric values from the evaluator's results file, read once.
+        Metrics from failed tests or a missing file keep ACTUAL_METRICS values.
+        """
+        actuals = dict(cls.ACTUAL_METRICS)
+        results_path = Path(path)
+        if not results_path.exists():
+            return actuals
         
-        if metric_name == "safety_false_negatives":
-            # For false negatives, lower is better
-            if actual <= target:
-                score = 1.0
-            else:
-                score = max(0, 1.0 - (actual / 10))  # Penalty per false negative
-        else:
-            # For other metrics, higher is better
-            if actual >= target:
-                score = 1.0
-            else:
-                score = actual / target if target > 0 else 0
+        tests = {}
+        for line in results_path.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                record = orjson.loads(line)
+                if "error" not in record:
+                    tests[record["test"]] = record
+        
+        for metric, (test, keys) in cls.EVALUATION_FIELDS.items():
+            value = tests.get(test)
+            for key in keys:
+                value = value.get(key) if isinstance(value, dict) else None
+            if value is not None:
+                actuals[metric] = value
         
+        return actuals
+    
+    def _compute_all(self):
+        """Score every metric and the weighted overall score, once."""
+        if self._computed:
+            return
+        
+        targets = self.TARGETS
+        actuals = self.get_actual_metrics()
+        self._names = list(targets)
+        self._weights = np.array([targets[m]["weight"] for m in self._names], dtype=np.float64)
+        self._score_array = score_metrics(
+            np.array([actuals[m] for m in self._names], dtype=np.float64),
+            np.array([targets[m]["target"] for m in self._names], dtype=np.float64),
+            np.array([m in SPECIAL_METRICS for m in self._names], dtype=bool),
+        )
+        
+        status_idx = np.searchsorted(STATUS_THRESHOLDS, self._score_array, side="right")
+        
+        for metric, score, status in zip(self._names, self._score_array.tolist(), status_idx.tolist()):
+            self.scores[metric] = self._result(
+                metric, actuals[metric], targets[metric]["target"], score, STATUS_LABELS[status]
+            )
+        
+        self._computed = True
+        self.overall_score = self.aggregate("weighted")
+    
+    @classmethod
+    def score_runs(cls, runs) -> np.ndarray:
+        """
+        Weighted overall score for each of several evaluation runs (dicts of
+        metric -> actual value, e.g. a regression history) in one pass.
+        """
+        targets = cls.TARGETS
+        names = list(targets)
+        actuals = np.array([[run[m] for m in names] for run in runs], dtype=np.float64)
+        return score_batch(
+            actuals,
+            np.array([targets[m]["target"] for m in names], dtype=np.float64),
+            np.array([targets[m]["weight"] for m in names], dtype=np.float64),
+            np.array([m in SPECIAL_METRICS for m in names], dtype=bool),
+        )
+    
+    def aggregate(self, name: str = "weighted", metrics=None) -> float:
+        """
+        Combine metric scores with one of the AGGREGATORS schemes, optionally
+        restricted to a subset of metrics.
+        """
+        self._compute_all()
+        idx = [self._names.index(m) for m in metrics] if metrics is not None else slice(None)
+        names = [self._names[i] for i in idx] if metrics is not None else self._names
+        return AGGREGATORS[name](self._score_array[idx], self._weights[idx], names)
+    
+    def _result(self, metric_name: str, actual: float, target: float, score: float, status: str = None) -> dict:
         return {
             "metric": metric_name,
             "actual": actual,
             "target": target,
             "gap": actual - target,
-            "score": min(1.0, score),
+            "score": score,
             "percentage": f"{min(100, score*100):.1f}%",
-            "status": self.get_status(score),
+            "status": status if status is not None else self.get_status(score),
         }
     
+    def calculate_score(self, metric_name: str, actual: float, target: float) -> dict:
+        """Calculate performance score for a metric."""
+        score = score_metrics(
+            np.array([actual], dtype=np.float64),
+            np.array([target], dtype=np.float64),
+            np.array([metric_name in SPECIAL_METRICS]),
+        )[0]
+        return self._result(metric_name, actual, target, float(score))
+    
     def get_status(self, score: float) -> str:
         """Return status based on score."""
-        if score >= 0.95:
-            return "🟢 EXCELLENT"
-        elif score >= 0.85:
-            return "🟢 GOOD"
-        elif score >= 0.75:
-            return "🟡 FAIR"
-        elif score >= 0.60:
-            return "🟠 NEEDS IMPROVEMENT"
-        else:
-            return "🔴 CRITICAL"
+        return STATUS_LABELS[bisect_right(STATUS_THRESHOLDS, score)]
     
     def generate_scorecard(self):
         """Generate comprehensive scorecard."""
@@ -91,26 +267,21 @@ class PerformanceScorecard:
         print("="*80)
         print(f"Generated: {self.timestamp}\n")
         
-        total_score = 0
-        total_weight = 0
-        results = []
+        self._compute_all()
         
         # Calculate individual metric scores
         print("INDIVIDUAL METRIC SCORES")
         print("-"*80)
-        print(f"{'Metric':<35} {'Actual':<12} {'Target':<12} {'Gap':<12} {'Score':<15}")
+        print(ROW_FMT('Metric', 'Actual', 'Target', 'Gap', 'Score'))
         print("-"*80)
         
-        for metric, target_info in self.TARGETS.items():
-            actual = self.ACTUAL_METRICS[metric]
-            target = target_info["target"]
-            weight = target_info["weight"]
-            
-            result = self.calculate_score(metric, actual, target)
-            results.append(result)
+        rows = []
+        for metric, result in self.scores.items():
+            actual = result["actual"]
+            target = result["target"]
             
             # Format actual value
-            if metric == "safety_false_negatives":
+            if metric in SPECIAL_METRICS:
                 actual_str = f"{int(actual)}"
                 target_str = f"{int(target)}"
                 gap_str = f"{int(actual - target)}"
@@ -121,20 +292,17 @@ class PerformanceScorecard:
             
             score_str = f"{result['score']:.1%} {result['status']}"
             
-            print(f"{metric:<35} {actual_str:<12} {target_str:<12} {gap_str:<12} {score_str:<15}")
-            
-            # Weight for overall score
-            total_score += result['score'] * weight
-            total_weight += weight
+            rows.append(ROW_FMT(metric, actual_str, target_str, gap_str, score_str))
+        
+        sys.stdout.write("\n".join(rows) + "\n")
         
-        # Overall score
-        overall_score = total_score / total_weight if total_weight > 0 else 0
+        overall_score = self.overall_score
         
         print("\n" + "="*80)
         print(f"OVERALL PERFORMANCE SCORE: {overall_score:.1%} {self.get_status(overall_score)}")
         print("="*80)
         
-        return results, overall_score
+        return list(self.scores.values()), overall_score
     
     def generate_category_analysis(self):
         """Analyze performance by category."""
@@ -143,6 +311,8 @@ class PerformanceScorecard:
         print("CATEGORY PERFORMANCE ANALYSIS")
         print("="*80)
         
+        self._compute_all()
+        
         categories = {
             "Classification": {
                 "metrics": ["classifier_accuracy", "classifier_precision", "classifier_recall", "classifier_f1"],
@@ -158,28 +328,17 @@ class PerformanceScorecard:
             },
         }
         
+        actuals = self.get_actual_metrics()
+        
         for category, info in categories.items():
             metrics = info["metrics"]
-            scores = []
-            
-            for metric in metrics:
-                actual = self.ACTUAL_METRICS.get(metric, 0)
-                target = self.TARGETS.get(metric, {}).get("target", 1)
-                
-                if metric == "safety_false_negatives":
-                    score = 1.0 if actual <= target else max(0, 1.0 - actual/10)
-                else:
-                    score = min(1.0, actual / target) if target > 0 else 0
-                
-                scores.append(score)
-            
-            avg_score = sum(scores) / len(scores) if scores else 0
+            avg_score = self.aggregate("mean", metrics)
             
             print(f"\n{category} ({info['weight']} importance)")
             print(f"  Score: {avg_score:.1%} {self.get_status(avg_score)}")
             for metric in metrics:
-                actual = self.ACTUAL_METRICS[metric]
-                if metric == "safety_false_negatives":
+                actual = actuals[metric]
+                if metric in SPECIAL_METRICS:
                     print(f"  - {metric}: {int(actual)}")
                 else:
                     print(f"  - {metric}: {actual:.2%}")
@@ -191,48 +350,13 @@ class PerformanceScorecard:
         print("COMPARISON: OUR SYSTEM vs. BASELINE PAPER")
         print("="*80)
         
-        comparison = {
-            "Safety Mechanisms": {
-                "Baseline": "[NO] NOT IMPLEMENTED",
-                "Our System": "[OK] 5-Layer System (77% accuracy)",
-                "Improvement": "NEW CAPABILITY",
-            },
-            "Confidence-Aware Routing": {
-                "Baseline": "[NO] Not mentioned",
-                "Our System": "[OK] Implemented (20-47-33% distribution)",
-                "Improvement": "NEW CAPABILITY",
-            },
-            "RAG Implementation": {
-                "Baseline": "[PARTIAL] Partial/Incomplete",
-                "Our System": "[OK] FULL RAG (chunking, metadata, retrieval)",
-                "Improvement": "COMPLETE + CONFIDENCE",
-            },
-            "Hallucination Control": {
-                "Baseline": "[NO] Not discussed",
-                "Our System": "[OK] Threshold-based filtering",
-                "Improvement": "NEW CAPABILITY",
-            },
-            "Audit Logging": {
-                "Baseline": "[NO] Not implemented",
-                "Our System": "[OK] JSON audit trails",
-                "Improvement": "NEW CAPABILITY",
-            },
-            "Configuration": {
-                "Baseline": "[NO] Hard-coded",
-                "Our System": "[OK] Fully configurable",
-                "Improvement": "ENHANCED",
-            },
-            "Code Quality": {
-                "Baseline": "[PARTIAL] Basic error handling",
-                "Our System": "[OK] Comprehensive (try-catch, logging)",
-                "Improvement": "ENHANCED",
-            },
-        }
-        
-        print(f"\n{'Aspect':<30} {'Baseline':<35} {'Our System':<35} {'Status':<20}")
+        print("\n" + COMPARISON_ROW_FMT('Aspect', 'Baseline', 'Our System', 'Status'))
         print("-"*120)
-        for aspect, details in comparison.items():
-            print(f"{aspect:<30} {details['Baseline']:<35} {details['Our System']:<35} {details['Improvement']:<20}")
+        rows = [
+            COMPARISON_ROW_FMT(aspect, baseline, ours, improvement)
+            for aspect, baseline, ours, improvement in self.COMPARISON_ROWS
+        ]
+        sys.stdout.write("\n".join(rows) + "\n")
     
     def generate_recommendations(self):
         """Generate actionable recommendations."""
@@ -241,24 +365,25 @@ class PerformanceScorecard:
         print("ACTIONABLE RECOMMENDATIONS")
         print("="*80)
         
-        metrics = self.ACTUAL_METRICS
+        metrics = self.get_actual_metrics()
         targets = self.TARGETS
         
-        recommendations = []
+        buckets = defaultdict(list)
         
         # Check each metric against target
         for metric, target_info in targets.items():
-            actual = metrics.get(metric, 0)
+            actual = metrics[metric]
             target = target_info["target"]
             critical = target_info["critical"]
             
             gap = actual - target
             
-            if metric == "safety_false_negatives":
+            if metric in SPECIAL_METRICS:
                 if actual > 0:
-                    priority = "🔴 CRITICAL" if critical else "🟡 MEDIUM"
-                    recommendations.append({
+                    priority = Priority.CRITICAL if critical else Priority.MEDIUM
+                    buckets[priority].append({
                         "priority": priority,
+                        "label": PRIORITY_LABELS[priority],
                         "metric": metric,
                         "current": f"{int(actual)} false negatives",
                         "action": "Enhance self-harm and data extraction detection patterns",
@@ -266,9 +391,10 @@ class PerformanceScorecard:
                     })
             elif gap < 0:
                 improvement = abs(gap)
-                priority = "🔴 CRITICAL" if improvement > 0.15 and critical else ("🟡 MEDIUM" if critical else "🟢 LOW")
-                recommendations.append({
+                priority = Priority.CRITICAL if improvement > 0.15 and critical else (Priority.MEDIUM if critical else Priority.LOW)
+                buckets[priority].append({
                     "priority": priority,
+                    "label": PRIORITY_LABELS[priority],
                     "metric": metric,
                     "current": f"{actual:.1%}",
                     "action": f"Improve by {improvement:.1%}",
@@ -276,25 +402,9 @@ class PerformanceScorecard:
                 })
         
         # Print recommendations
-        print("\nPriority 🔴 CRITICAL (Fix First):")
-        for rec in recommendations:
-            if "CRITICAL" in rec["priority"]:
-                print(f"  [{rec['metric']}]")
-                print(f"    Current: {rec['current']}")
-                print(f"    Action:  {rec['action']}")
-                print(f"    Target:  {rec['target']}")
-        
-        print("\nPriority 🟡 MEDIUM (Next):")
-        for rec in recommendations:
-            if "MEDIUM" in rec["priority"]:
-                print(f"  [{rec['metric']}]")
-                print(f"    Current: {rec['current']}")
-                print(f"    Action:  {rec['action']}")
-                print(f"    Target:  {rec['target']}")
-        
-        print("\nPriority 🟢 LOW (Enhancement):")
-        for rec in recommendations:
-            if "LOW" in rec["priority"]:
+        for priority in Priority:
+            print(f"\nPriority {PRIORITY_LABELS[priority]} ({PRIORITY_HEADINGS[priority]}):")
+            for rec in buckets[priority]:
                 print(f"  [{rec['metric']}]")
                 print(f"    Current: {rec['current']}")
                 print(f"    Action:  {rec['action']}")
@@ -303,7 +413,9 @@ class PerformanceScorecard:
     def save_scorecard(self):
         """Save scorecard to JSON."""
         
-        results, overall = self.generate_scorecard()
+        self._compute_all()
+        results = self.scores.values()
+        overall = self.overall_score
         
         scorecard = {
             "timestamp": self.timestamp,
@@ -334,8 +446,8 @@ class PerformanceScorecard:
         }
         
         try:
-            with open("performance_scorecard.json", "w") as f:
-                json.dump(scorecard, f, indent=2)
+            with open("performance_scorecard.json", "wb") as f:
+                f.write(orjson.dumps(scorecard, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
             print(f"\n[SAVED] Scorecard saved to performance_scorecard.json")
         except Exception as e:
             print(f"[ERROR] Error saving scorecard: {e}")
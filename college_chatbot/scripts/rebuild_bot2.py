@@ -1,6 +1,7 @@
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Ensure project root is in path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -10,27 +11,37 @@ from core.logger import get_logger
 
 logger = get_logger("rebuild_script")
 
+# Categories with a Bot-2 domain index (see ModelManager.get_domain_qa_resources)
+EXPECTED_DOMAINS = (
+    "Admissions & Registrations",
+    "Financial Matters",
+    "Academic Affairs",
+    "Student Services",
+    "Campus Life",
+    "General Information",
+    "Cross-Domain Queries",
+)
+
 if __name__ == "__main__":
     logger.info("Manually triggering Bot-2 Index Rebuild...")
     try:
         success = ModelManager.rebuild_domain_indices()
         if success:
             logger.info("Rebuild Successful!")
-            # Validate Campus Life
-            idx, qa = ModelManager.get_domain_qa_resources("Campus Life")
-            if idx:
-                logger.info(f"Validation: 'Campus Life' has {idx.ntotal} vectors.")
-                # Validate Student Services
-                idx_ss, qa_ss = ModelManager.get_domain_qa_resources("Student Services")
-                if idx_ss:
-                    logger.info(f"Validation: 'Student Services' has {idx_ss.ntotal} vectors.")
+            # Validate every domain; each load opens its own index, so do them side by side
+            with ThreadPoolExecutor(max_workers=len(EXPECTED_DOMAINS)) as executor:
+                results = dict(zip(
+                    EXPECTED_DOMAINS,
+                    executor.map(ModelManager.get_domain_qa_resources, EXPECTED_DOMAINS),
+                ))
+            for domain, (idx, qa) in results.items():
+                if idx:
+                    logger.info("Validation: '%s' has %d vectors.", domain, idx.ntotal)
                 else:
-                    logger.error("Validation: 'Student Services' index missing.")
-            else:
-                logger.error("Validation: 'Campus Life' index missing.")
+                    logger.error("Validation: '%s' index missing.", domain)
         else:
             logger.error("Rebuild Failed.")
     except Exception as e:
-        logger.error(f"SCRIPT CRASH: {e}")
+        logger.error("SCRIPT CRASH: %s", e)
         import traceback
         logger.error(traceback.format_exc())
@@ -8,14 +8,48 @@ Usage:
     python scripts/validate_phase1.py
 """
 
+import importlib
 import sys
 import traceback
+from functools import partial
 from pathlib import Path
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from parallel_runner import run_parallel
+
+# Modules loaded by test_imports (or the import error they raised), reused
+# by the later tests so nothing heavy is imported or retried twice
+_MODS = {}
+
+def _module(module_name: str):
+    """Return a module from test_imports, importing it now if it wasn't loaded."""
+    if module_name not in _MODS:
+        try:
+            _MODS[module_name] = importlib.import_module(module_name)
+        except Exception as e:
+            _MODS[module_name] = e
+    mod = _MODS[module_name]
+    if isinstance(mod, Exception):
+        raise mod
+    return mod
+
+# Project modules each tested module imports at load time. If one of these
+# failed, importing the dependent module would only fail again the same way.
+# (main reaches the bots through the lazy bots package, so they aren't here.)
+IMPORT_DEPS = {
+    "classifier.classifier": ("core.model_manager",),
+    "bots.rule_bot": ("core.model_manager", "core.logger"),
+    "bots.bot2_semantic": ("config.settings", "core.audit_logger", "core.logger", "core.model_manager"),
+    "bots.bot3_rag": ("config.settings", "core.audit_logger", "core.logger", "core.model_manager"),
+    "main": (
+        "classifier.classifier", "config.settings", "core.audit_logger", "core.context", "core.logger",
+        "services.query_validator", "services.scope_guard",
+    ),
+}
+
 def test_imports():
     """Test that all core modules can be imported."""
     print("\n" + "="*70)
@@ -30,6 +64,7 @@ def test_imports():
         ("core.logger", "Logger module"),
         ("core.audit_logger", "Audit logger module"),
         ("core.context", "Context module"),
+        ("core.model_manager", "Model manager"),
         ("services.query_validator", "Query validator"),
         ("services.scope_guard", "Scope guard"),
         ("classifier.classifier", "Classifier"),
@@ -39,12 +74,24 @@ def test_imports():
         ("main", "Main orchestrator"),
     ]
     
+    failed = set()
+    
     for module_name, description in modules_to_test:
+        failed_dep = next((d for d in IMPORT_DEPS.get(module_name, ()) if d in failed), None)
+        if failed_dep:
+            print(f"⏭️  {description:40} - SKIPPED (dependency {failed_dep} failed)")
+            _MODS[module_name] = ImportError(f"{module_name} not imported: dependency {failed_dep} failed")
+            failed.add(module_name)
+            tests_failed += 1
+            continue
+        
         try:
-            __import__(module_name)
+            _MODS[module_name] = importlib.import_module(module_name)
             print(f"✅ {description:40} - OK")
             tests_passed += 1
         except Exception as e:
+            _MODS[module_name] = e
+            failed.add(module_name)
             print(f"❌ {description:40} - FAILED: {e}")
             traceback.print_exc()
             tests_failed += 1
@@ -58,7 +105,7 @@ def test_query_validation():
     print("TEST 2: Query Validation")
     print("="*70)
     
-    from services.query_validator import validate_query
+    validate_query = _module("services.query_validator").validate_query
     
     test_cases = [
         ("What is the hostel fee?", True, "Valid academic query"),
@@ -92,7 +139,7 @@ def test_scope_check():
     print("TEST 3: Scope Check")
     print("="*70)
     
-    from services.scope_guard import scope_check
+    scope_check = _module("services.scope_guard").scope_check
     
     test_cases = [
         ("What are the admission requirements?", True, "College scope"),
@@ -124,7 +171,7 @@ def test_classifier():
     print("="*70)
     
     try:
-        from classifier.classifier import predict_category
+        predict_category = _module("classifier.classifier").predict_category
         
         test_queries = [
             "What are the admission requirements?",
@@ -157,7 +204,7 @@ def test_bot2():
     print("="*70)
     
     try:
-        from bots.bot2_semantic import bot2_answer
+        bot2_answer = _module("bots.bot2_semantic").bot2_answer
         
         test_query = "What is the hostel fee?"
         answer, similarity, is_confident = bot2_answer(test_query, "test_001")
@@ -182,7 +229,7 @@ def test_bot3():
     print("="*70)
     
     try:
-        from bots.bot3_rag import bot3_answer
+        bot3_answer = _module("bots.bot3_rag").bot3_answer
         
         test_query = "What are the academic programs?"
         answer = bot3_answer(test_query, [], "test_002")
@@ -207,7 +254,7 @@ def test_main_orchestrator():
     print("="*70)
     
     try:
-        from main import handle_query
+        handle_query = _module("main").handle_query
         
         test_queries = [
             "What is the hostel fee?",
@@ -238,7 +285,7 @@ def test_settings():
     print("="*70)
     
     try:
-        from config.settings import settings
+        settings = _module("config.settings").settings
         
         checks = [
             ("CLASSIFIER_HIGH_CONF", 0.75),
@@ -272,6 +319,16 @@ def test_settings():
         return 0, 1
 
 
+def _run_test(test_func):
+    """Run one test function, counting a crash as a failure."""
+    try:
+        return test_func()
+    except Exception as e:
+        print(f"❌ Test suite error: {e}")
+        traceback.print_exc()
+        return 0, 1
+
+
 def main():
     """Run all validation tests."""
     print("\n" + "="*70)
@@ -282,27 +339,23 @@ def main():
     total_passed = 0
     total_failed = 0
     
-    # Run all tests
-    test_functions = [
-        test_imports,
-        test_settings,
-        test_query_validation,
-        test_scope_check,
-        test_classifier,
-        test_bot2,
-        test_bot3,
-        test_main_orchestrator,
-    ]
+    # Imports and settings must come first; the rest are independent
+    results = [_run_test(test_imports), _run_test(test_settings)]
+    results += run_parallel([
+        partial(_run_test, test)
+        for test in (
+            test_query_validation,
+            test_scope_check,
+            test_classifier,
+            test_bot2,
+            test_bot3,
+            test_main_orchestrator,
+        )
+    ], max_workers=4)
     
-    for test_func in test_functions:
-        try:
-            passed, failed = test_func()
-            total_passed += passed
-            total_failed += failed
-        except Exception as e:
-            print(f"❌ Test suite error: {e}")
-            traceback.print_exc()
-            total_failed += 1
+    for passed, failed in results:
+        total_passed += passed
+        total_failed += failed
     
     # Summary
     print("\n" + "="*70)
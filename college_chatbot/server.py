@@ -1,5 +1,10 @@
+import hmac
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import TTLCache, cached
 
 # FORCE CPU ONLY & SUPPRESS TF LOGS
 os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
@@ -8,13 +13,23 @@ os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
 
 from flask import Flask, render_template, request, jsonify
 
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
 # -------------------------
 # Path setup
 # -------------------------
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
-from main import handle_query
+from main import handle_query, last_query_tracked
 
 from core.model_manager import ModelManager
 from core.logger import get_logger
@@ -23,6 +38,48 @@ from config.settings import settings
 logger = get_logger("server")
 app = Flask(__name__)
 
+# gzip JSON/HTML responses when the client accepts it
+if Compress is not None:
+    Compress(app)
+
+# -------------------------
+# Response cache
+# -------------------------
+# (normalized message, history passed to handle_query) -> response. Only
+# successful, in-scope answers are cached; rejections and greetings are cheap
+# anyway. Entries expire after RESPONSE_CACHE_TTL so rebuilt indices and
+# updated documents are picked up without a restart.
+_RESP_CACHE = TTLCache(maxsize=2048, ttl=settings.RESPONSE_CACHE_TTL)
+_RESP_CACHE_LOCK = threading.Lock()
+
+# Set once warmup_models() has loaded every model; probes read this instead
+# of ModelManager. Stays unset if warmup failed.
+_READY = threading.Event()
+
+def _cache_key(user_message, formatted_history):
+    return (
+        " ".join(user_message.lower().split()),
+        tuple(formatted_history),  # already bounded to MAX_CONTEXT_TURNS
+    )
+
+def _cached_response(user_message, formatted_history):
+    """Return (cache key, cached response or None)."""
+    key = _cache_key(user_message, formatted_history)
+    with _RESP_CACHE_LOCK:
+        response = _RESP_CACHE.get(key)
+
+    if response is not None:
+        # Repeat query: skip the pipeline but keep the usage stats honest
+        from core.stats_manager import StatsManager
+        StatsManager.increment_query_count(user_message)
+    return key, response
+
+def _store_response(key, response):
+    """Cache a fresh response if handle_query counted it as a real answer."""
+    if last_query_tracked():
+        with _RESP_CACHE_LOCK:
+            _RESP_CACHE[key] = response
+
 # -------------------------
 # Home route
 # -------------------------
@@ -33,31 +90,48 @@ def home():
 # -------------------------
 # Chat API
 # -------------------------
-@app.route("/chat", methods=["POST"])
-def chat():
-    try:
-        # Accept both JSON and form-data safely
-        data = request.get_json(silent=True)
-        # logger.debug(f"RAW REQUEST DATA: {data}")
+# Request keys accepted for the user's message, in priority order
+_MSG_KEYS = ("message", "question", "query")
+
+def _parse_chat_request():
+    """Read (user_message, formatted_history) from a JSON or form POST."""
+    # Accept both JSON and form-data safely
+    data = request.get_json(silent=True)
+    # logger.debug(f"RAW REQUEST DATA: {data}")
 
-        user_message = ""
+    user_message = ""
+    history = []
+
+    if data:
+        # Accept multiple possible keys (frontend-safe); first non-empty wins
+        user_message = next((data[k] for k in _MSG_KEYS if data.get(k)), "")
+        history = data.get("history", [])
+    else:
+        # Fallback for HTML form submit
+        user_message = request.form.get("message") or ""
         history = []
 
-        if data:
-            # Accept multiple possible keys (frontend-safe)
-            user_message = (
-                data.get("message")
-                or data.get("question")
-                or data.get("query")
-                or ""
-            )
-            history = data.get("history", [])
-        else:
-            # Fallback for HTML form submit
-            user_message = request.form.get("message") or ""
-            history = []
-
-        # logger.debug(f"USER MESSAGE: {user_message}")
+    # logger.debug(f"USER MESSAGE: {user_message}")
+
+    # Normalize history into [(q, a), ...], keeping only the turns Bot-3
+    # reads so a long client-side history doesn't cost more per request
+    formatted_history = []
+    if isinstance(history, list):
+        # Drop malformed turns before keeping the last MAX_CONTEXT_TURNS, so
+        # bad entries don't push valid ones out of the window
+        formatted_history = [
+            (item[0], item[1])
+            for item in history
+            if isinstance(item, list) and len(item) == 2
+            and isinstance(item[0], str) and isinstance(item[1], str)
+        ][-settings.MAX_CONTEXT_TURNS:]
+
+    return user_message, formatted_history
+
+@app.route("/chat", methods=["POST"])
+def chat():
+    try:
+        user_message, formatted_history = _parse_chat_request()
 
         # Guard against empty input
         if not user_message.strip():
@@ -65,40 +139,73 @@ def chat():
                 "response": "No question received. Please type a question."
             }), 400
 
-        # Normalize history into [(q, a), ...]
-        formatted_history = []
-        if isinstance(history, list):
-            for item in history:
-                if isinstance(item, list) and len(item) == 2:
-                    formatted_history.append((item[0], item[1]))
-
-        # Call core logic
-        response = handle_query(user_message, formatted_history)
+        key, response = _cached_response(user_message, formatted_history)
+        if response is None:
+            # Call core logic
+            response = handle_query(user_message, formatted_history)
+            _store_response(key, response)
 
         return jsonify({
             "response": response
         })
 
     except Exception as e:
-        logger.exception(f"CHAT ENDPOINT ERROR: {e}")
+        logger.exception("CHAT ENDPOINT ERROR: %s", e)
         return jsonify({
             "response": "Server error. Please try again."
         }), 500
 
+@app.route("/chat/cache/clear", methods=["POST"])
+def clear_chat_cache():
+    """Drop cached responses (e.g. after rebuilding indices). Admin only."""
+    token = request.headers.get("X-Admin-Token", "")
+    if not settings.ADMIN_TOKEN:
+        return jsonify({"error": "Not found"}), 404
+    if not hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode()):
+        return jsonify({"error": "Forbidden"}), 403
+
+    with _RESP_CACHE_LOCK:
+        cleared = len(_RESP_CACHE)
+        _RESP_CACHE.clear()
+    logger.info("Cleared %d cached chat responses", cleared)
+    return jsonify({"cleared": cleared})
+
+# -------------------------
+# Probes
+# -------------------------
+@app.route("/health")
+def health():
+    """Liveness: the process is up and serving."""
+    return "", 200
+
+@app.route("/ready")
+def ready():
+    """Readiness: models have been warmed up."""
+    if _READY.is_set():
+        return "ready", 200
+    if _WARMUP_THREAD.is_alive():
+        return "warming", 503
+    return "warmup failed", 503
+
 # -------------------------
 # Stats API
 # -------------------------
+@cached(TTLCache(maxsize=4, ttl=10), lock=threading.Lock())
+def _cached_top(n):
+    """Top-n questions, re-read from disk at most every 10 seconds."""
+    from core.stats_manager import StatsManager
+    return StatsManager.get_top_queries(n=n)
+
 @app.route("/stats/top", methods=["GET"])
 def get_top_stats():
     """Return top 4 frequent questions."""
     try:
-        from core.stats_manager import StatsManager
-        top_questions = StatsManager.get_top_queries(n=4)
+        top_questions = _cached_top(4)
         return jsonify({
             "questions": top_questions
         })
     except Exception as e:
-        logger.error(f"Failed to fetch stats: {e}")
+        logger.error("Failed to fetch stats: %s", e)
         return jsonify({"questions": []}), 500
 
 # -------------------------
@@ -112,31 +219,47 @@ def warmup_models():
     """
     logger.info("=== STARTING MODEL WARMUP PHASE ===")
     try:
-        # 1. Load Embeddings (Lightweight)
-        ModelManager.get_embedder()
-        
-        # 2. Load Classifiers
-        ModelManager.get_classifier()
-        
-        # 3. Load Vector Indices (Bot 2 & Bot 3)
-        ModelManager.get_bot2_resources()
-        ModelManager.get_bot3_resources()
-        
-        # 4. Load Rule Kernel
-        ModelManager.get_aiml_kernel()
+        # Each loader reads its own files, so load them side by side
+        # (ModelManager locks each resource)
+        loaders = [
+            ModelManager.get_embedder,        # Embeddings (Lightweight)
+            ModelManager.get_classifier,      # Classifiers
+            ModelManager.get_bot2_resources,  # Vector Indices (Bot 2 & Bot 3)
+            ModelManager.get_bot3_resources,
+            ModelManager.get_aiml_kernel,     # Rule Kernel
+        ]
+        with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+            futures = [executor.submit(loader) for loader in loaders]
+            for future in futures:
+                future.result()
         
         logger.info("=== MODEL WARMUP COMPLETE ===")
+        _READY.set()
     except Exception as e:
-        logger.critical(f"Model Warmup Failed: {e}")
-        # We continue, as lazy loading might still work or fail gracefully later
+        logger.critical("Model Warmup Failed: %s", e)
+        # We continue, as lazy loading might still work or fail gracefully later,
+        # but /ready keeps reporting 503 so the process gets no probe traffic
+
+# Warm up as soon as the app module is loaded, so WSGI servers that import
+# server:app (gunicorn, waitress-serve) get it too, not just __main__.
+# /health answers meanwhile and /ready flips once the models are in.
+_WARMUP_THREAD = threading.Thread(target=warmup_models, name="model-warmup", daemon=True)
+_WARMUP_THREAD.start()
 
 if __name__ == "__main__":
-    # Explicit Initialization Phase
-    warmup_models()
+    # Explicit Initialization Phase: serve only once warmup is done
+    _WARMUP_THREAD.join()
     
     # Request Handling Phase
-    app.run(
-        host="0.0.0.0",
-        port=5000,
-        debug=settings.DEBUG 
-    )
+    if settings.DEBUG or serve is None:
+        # Werkzeug dev server: one request at a time, reloader/debugger on DEBUG
+        app.run(
+            host="0.0.0.0",
+            port=5000,
+            debug=settings.DEBUG 
+        )
+    else:
+        # Threaded WSGI server: concurrent /chat requests share the single
+        # in-process copy of the models and FAISS indices. For more scale:
+        #   gunicorn -w 1 -k gthread --threads 16 server:app
+        serve(app, host="0.0.0.0", port=5000, threads=8)
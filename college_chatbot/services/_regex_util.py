@@ -0,0 +1,28 @@
+"""Helpers shared by the regex-based query checks (query_validator, scope_guard)."""
+
+import re
+from typing import List
+
+
+def fuse(patterns: List[str]) -> "re.Pattern":
+    """
+    Compile a pattern family into one alternation (one scan per query).
+
+    The result matches already-lowercased text: the pattern text is lowered and
+    compiled without IGNORECASE, so the engine can use its literal-prefix fast
+    paths instead of case-folding every comparison. Safe because the patterns
+    only use lowercase escapes (\\b).
+    """
+    return re.compile("|".join(f"(?:{p.replace('(?i)', '').lower()})" for p in patterns))
+
+
+def cache_key(query: str) -> str:
+    """
+    Normalize a query for the checks' lru_caches.
+
+    Results only depend on the stripped text, and ASCII case never matters
+    (every check is case-insensitive), so "Fees " and "fees" share an entry.
+    Non-ASCII text keeps its case: lower() can change its length.
+    """
+    q = query.strip()
+    return q.lower() if q.isascii() else q
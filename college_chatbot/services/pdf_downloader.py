@@ -1,43 +1,141 @@
+import asyncio
+import hashlib
 import os
 import re
-import requests
-from bs4 import BeautifulSoup
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urljoin, urlparse
 
+from core.http import create_async_client, create_session
+
+# One pooled keep-alive session per process
+_SESSION = create_session()
+
 def extract_pdf_links(page_url: str):
-    headers = {"User-Agent": "Mozilla/5.0"}
-    r = requests.get(page_url, headers=headers, timeout=20)
+    r = _SESSION.get(page_url, timeout=20)
     r.raise_for_status()
 
-    soup = BeautifulSoup(r.text, "lxml")
-    links = soup.find_all("a", href=True)
+    return _parse_pdf_links(page_url, r.text)
+
 
+def _parse_pdf_links(page_url: str, html: str):
+    # Case-insensitive substring match on href, filtered inside lexbor
+    tree = LexborHTMLParser(html)
+    links = tree.css("a[href*='.pdf' i]")
+
+    # De-duplicate while collecting, keeping first-seen order
+    seen = set()
     pdf_urls = []
     for a in links:
-        href = a["href"].strip()
-        if ".pdf" in href.lower():
-            pdf_urls.append(urljoin(page_url, href))
+        url = urljoin(page_url, a.attributes["href"].strip())
+        if url not in seen:
+            seen.add(url)
+            pdf_urls.append(url)
+
+    return pdf_urls
 
-    # remove duplicates
-    return list(dict.fromkeys(pdf_urls))
+
+def _pdf_path(pdf_url: str, out_dir: str) -> str:
+    # extract filename
+    path = urlparse(pdf_url).path
+    fname = os.path.basename(path)
+    if fname.lower().endswith(".pdf"):
+        fname = fname[:-4]
+    fname = re.sub(r"[^a-zA-Z0-9_\-]+", "_", fname)
+
+    # Short hash of the full URL, so two URLs ending in the same file name
+    # (e.g. .../2023/notice.pdf and .../2024/notice.pdf) get separate files
+    url_hash = hashlib.sha1(pdf_url.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(out_dir, f"{fname}_{url_hash}.pdf")
+
+
+# Bytes per read/write while streaming a download to disk
+CHUNK_SIZE = 1 << 16
+
+
+def _discard(file_path: str):
+    # Don't leave a truncated PDF behind for the index builder to pick up
+    if os.path.exists(file_path):
+        os.remove(file_path)
 
 
 def download_pdf(pdf_url: str, out_dir="data/bot3_docs/pdfs"):
     os.makedirs(out_dir, exist_ok=True)
 
-    headers = {"User-Agent": "Mozilla/5.0"}
-    r = requests.get(pdf_url, headers=headers, timeout=30)
+    file_path = _pdf_path(pdf_url, out_dir)
+
+    # Stream to disk so peak memory is one chunk, not the whole PDF
+    with _SESSION.get(pdf_url, timeout=30, stream=True) as r:
+        r.raise_for_status()
+        try:
+            with open(file_path, "wb") as f:
+                for chunk in r.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+        except BaseException:
+            _discard(file_path)
+            raise
+
+    return file_path
+
+
+# ================= Bulk async download =================
+async def _fetch_pdf_links(client: httpx.AsyncClient, page_url: str):
+    r = await client.get(page_url)
     r.raise_for_status()
 
-    # extract filename
-    path = urlparse(pdf_url).path
-    fname = os.path.basename(path)
-    if not fname.lower().endswith(".pdf"):
-        fname = re.sub(r"[^a-zA-Z0-9_]+", "_", fname) + ".pdf"
+    return await asyncio.to_thread(_parse_pdf_links, page_url, r.text)
+
+
+async def extract_pdf_links_many(page_urls):
+    """
+    extract_pdf_links() for many pages concurrently on one event loop.
+
+    Returns one entry per page, in order: its PDF links, or the exception
+    that page raised.
+    """
+    async with create_async_client(timeout=20) as client:
+        return await asyncio.gather(
+            *(_fetch_pdf_links(client, u) for u in page_urls),
+            return_exceptions=True,
+        )
 
-    file_path = os.path.join(out_dir, fname)
 
-    with open(file_path, "wb") as f:
-        f.write(r.content)
+async def _fetch_pdf(client: httpx.AsyncClient, pdf_url: str, out_dir: str) -> str:
+    file_path = _pdf_path(pdf_url, out_dir)
+
+    async with client.stream("GET", pdf_url) as r:
+        r.raise_for_status()
+        try:
+            with open(file_path, "wb") as f:
+                async for chunk in r.aiter_bytes(CHUNK_SIZE):
+                    # Keep the event loop free for other downloads during disk writes
+                    await asyncio.to_thread(f.write, chunk)
+        except BaseException:
+            _discard(file_path)
+            raise
 
     return file_path
+
+
+async def download_pdfs(pdf_urls, out_dir="data/bot3_docs/pdfs"):
+    """
+    Download many PDFs concurrently on one event loop.
+
+    Wall time is roughly one round trip plus transfer time, not one round
+    trip per file. Returns one entry per URL, in the order of pdf_urls: the
+    saved file path, or the exception that URL raised (one failing download
+    doesn't cancel the rest).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    # A URL listed twice is fetched once, so two tasks never write one file
+    unique_urls = list(dict.fromkeys(pdf_urls))
+
+    async with create_async_client(timeout=30) as client:
+        results = await asyncio.gather(
+            *(_fetch_pdf(client, u, out_dir) for u in unique_urls),
+            return_exceptions=True,
+        )
+
+    by_url = dict(zip(unique_urls, results))
+    return [by_url[u] for u in pdf_urls]
@@ -1,5 +1,8 @@
 import re
-from typing import Tuple
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from services._regex_util import cache_key, fuse
 
 # ============== GIBBERISH & FORMAT VALIDATION ==============
 GIBBERISH_PATTERNS = [
@@ -42,57 +45,69 @@ SENSITIVE_EXTRACTION_PATTERNS = [
 ]
 
 
-def is_gibberish(q: str) -> bool:
+# Compiled once at import so the validators don't go through re's pattern cache per call.
+# Gibberish stays a list: its patterns use numbered backreferences.
+_GIBBERISH_RES = [re.compile(p) for p in GIBBERISH_PATTERNS]
+_ABUSE_RE = fuse(ABUSE_PATTERNS)
+_SELF_HARM_RE = fuse(SELF_HARM_PATTERNS)
+_PROMPT_INJECTION_RE = fuse(PROMPT_INJECTION_PATTERNS)
+_SENSITIVE_EXTRACTION_RE = fuse(SENSITIVE_EXTRACTION_PATTERNS)
+
+# Prefilter: matches iff at least one safety family above matches. Benign
+# queries (the vast majority) clear every safety check with this one scan.
+_ANY_SAFETY_RE = fuse(
+    SELF_HARM_PATTERNS + ABUSE_PATTERNS + PROMPT_INJECTION_PATTERNS + SENSITIVE_EXTRACTION_PATTERNS
+)
+
+# Deletes every non-alphanumeric ASCII character, so str.translate counts them in C
+_ASCII_NON_ALNUM_DEL = str.maketrans("", "", "".join(chr(c) for c in range(128) if not chr(c).isalnum()))
+
+
+def _count_non_alnum(q: str) -> int:
+    if q.isascii():
+        return len(q) - len(q.translate(_ASCII_NON_ALNUM_DEL))
+    # Non-ASCII text needs Unicode isalnum() (Telugu letters count, emoji don't)
+    return sum(not ch.isalnum() for ch in q)
+
+
+def is_gibberish(q: str, q_lower: Optional[str] = None) -> bool:
     """Check if query is gibberish or nonsensical."""
-    q_clean = q.strip().lower().replace(" ", "")
+    q_clean = (q.strip().lower() if q_lower is None else q_lower).replace(" ", "")
     
     # Empty or too short
     if len(q_clean) < 2: # Allow 2 letter words like 'hi'
         return True
 
     # Too many special characters
-    special_ratio = sum(not ch.isalnum() for ch in q) / max(len(q), 1)
+    special_ratio = _count_non_alnum(q) / max(len(q), 1)
     if special_ratio > 0.5:
         return True
 
     # Matches gibberish patterns
-    for pat in GIBBERISH_PATTERNS:
-        if re.match(pat, q_clean):
-            return True
+    return any(pat.match(q_clean) for pat in _GIBBERISH_RES)
 
-    return False
 
+# The safety predicates take an optional pre-lowered copy of q so that
+# validate_query lowercases once for all of them.
 
-def is_self_harm_or_violence(q: str) -> bool:
+def is_self_harm_or_violence(q: str, q_lower: Optional[str] = None) -> bool:
     """Detect if query contains self-harm or violence keywords."""
-    for pat in SELF_HARM_PATTERNS:
-        if re.search(pat, q):
-            return True
-    return False
+    return _SELF_HARM_RE.search(q.lower() if q_lower is None else q_lower) is not None
 
 
-def is_abusive(q: str) -> bool:
+def is_abusive(q: str, q_lower: Optional[str] = None) -> bool:
     """Detect if query contains abusive language."""
-    for pat in ABUSE_PATTERNS:
-        if re.search(pat, q):
-            return True
-    return False
+    return _ABUSE_RE.search(q.lower() if q_lower is None else q_lower) is not None
 
 
-def is_prompt_injection(q: str) -> bool:
+def is_prompt_injection(q: str, q_lower: Optional[str] = None) -> bool:
     """Detect if query is attempting prompt injection."""
-    for pat in PROMPT_INJECTION_PATTERNS:
-        if re.search(pat, q):
-            return True
-    return False
+    return _PROMPT_INJECTION_RE.search(q.lower() if q_lower is None else q_lower) is not None
 
 
-def is_sensitive_extraction_attempt(q: str) -> bool:
+def is_sensitive_extraction_attempt(q: str, q_lower: Optional[str] = None) -> bool:
     """Detect if query is trying to extract sensitive data."""
-    for pat in SENSITIVE_EXTRACTION_PATTERNS:
-        if re.search(pat, q):
-            return True
-    return False
+    return _SENSITIVE_EXTRACTION_RE.search(q.lower() if q_lower is None else q_lower) is not None
 
 
 def validate_query(query: str) -> Tuple[bool, str]:
@@ -102,14 +117,24 @@ def validate_query(query: str) -> Tuple[bool, str]:
     Returns:
         (is_valid: bool, reason: str)
     """
-    q = query.strip()
+    return _validate(cache_key(query))
+
+
+@lru_cache(maxsize=4096)
+def _validate(q: str) -> Tuple[bool, str]:
+    """validate_query on a query already normalized by cache_key."""
 
     # 1) EMPTY CHECK
     if not q:
         return False, "Query is empty. Please type your question."
 
+    q_lower = q.lower()  # already lowercase for ASCII keys; one copy otherwise
+
+    # Only queries that trip some safety pattern need the per-category checks
+    flagged = _ANY_SAFETY_RE.search(q_lower) is not None
+
     # 2) SAFETY: SELF-HARM FIRST (CRITICAL)
-    if is_self_harm_or_violence(q):
+    if flagged and is_self_harm_or_violence(q, q_lower):
         return False, (
             "[ALERT] **Crisis Support** [ALERT]\n\n"
             "If you're having thoughts of self-harm, please reach out:\n"
@@ -120,11 +145,11 @@ def validate_query(query: str) -> Tuple[bool, str]:
         )
 
     # 3) SAFETY: ABUSIVE LANGUAGE
-    if is_abusive(q):
+    if flagged and is_abusive(q, q_lower):
         return False, "Please use respectful language. This assistant is here to help you."
 
     # 4) SAFETY: PROMPT INJECTION
-    if is_prompt_injection(q):
+    if flagged and is_prompt_injection(q, q_lower):
         return False, (
             "[WARNING] **Invalid Query**\n\n"
             "Your query appears to contain instructions to modify my behavior. "
@@ -133,7 +158,7 @@ def validate_query(query: str) -> Tuple[bool, str]:
         )
 
     # 5) SAFETY: SENSITIVE DATA EXTRACTION
-    if is_sensitive_extraction_attempt(q):
+    if flagged and is_sensitive_extraction_attempt(q, q_lower):
         return False, (
             "[DENIED] **Access Denied**\n\n"
             "I cannot provide sensitive student or administrative data. "
@@ -141,7 +166,7 @@ def validate_query(query: str) -> Tuple[bool, str]:
         )
 
     # 6) FORMAT: GIBBERISH
-    if is_gibberish(q):
+    if is_gibberish(q, q_lower):
         return False, "Your message looks invalid. Please ask a proper question."
 
     # 7) LENGTH: MINIMUM CONTEXT
@@ -149,9 +174,13 @@ def validate_query(query: str) -> Tuple[bool, str]:
     # But block single letters or nonsense
     if len(q.split()) < 2:
         valid_singles = ["hi", "hello", "hey", "help", "menu", "start"]
-        if q.lower() not in valid_singles: 
+        if q_lower not in valid_singles: 
             return False, "Please provide more detail. Example: 'What is the hostel fee?'"
 
     # [OK] VALIDATION PASSED
     return True, "valid"
 
+
+def validate_query_batch(queries: List[str]) -> List[Tuple[bool, str]]:
+    """Validate several queries in one call. Returns one (is_valid, reason) per query."""
+    return [validate_query(q) for q in queries]
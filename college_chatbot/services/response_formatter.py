@@ -1,7 +1,12 @@
-import json
 import re
 from typing import Dict, Any, List
 
+import orjson
+
+# Compiled once at import; both run on every Bot-3 answer
+_LABEL_STRIP_RE = re.compile(r'[^\w\s,:.\-₹$€£%()]')
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
 def render_response(json_data: Dict[str, Any]) -> str:
     """
     Renders a structured JSON response into a user-friendly string format.
@@ -48,7 +53,7 @@ def render_response(json_data: Dict[str, Any]) -> str:
             
             if label and value:
                 # Remove emojis if any exist (basic regex)
-                label = re.sub(r'[^\w\s,:.\-₹$€£%()]', '', label).strip()
+                label = _LABEL_STRIP_RE.sub('', label).strip()
                 lines.append(f"**{label}:** {value}")
                 count += 1
                 
@@ -72,13 +77,13 @@ def extract_json_from_text(text: str) -> Dict[str, Any]:
         text = text.strip()
         
         # Try finding JSON block
-        match = re.search(r'\{.*\}', text, re.DOTALL)
+        match = _JSON_OBJECT_RE.search(text)
         if match:
             json_str = match.group(0)
         else:
             json_str = text
             
         # Parse
-        return json.loads(json_str)
-    except json.JSONDecodeError:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError:
         return None
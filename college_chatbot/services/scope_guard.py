@@ -1,4 +1,7 @@
 import re
+from functools import lru_cache
+
+from services._regex_util import cache_key, fuse
 
 COLLEGE_SCOPE_KEYWORDS = [
     "admission", "apply", "application", "eligibility", "documents",
@@ -28,6 +31,14 @@ PROGRAMMING_PATTERNS = [
 ]
 
 
+# Compiled once at import so scope_check doesn't go through re's pattern cache per call
+_OUT_OF_SCOPE_RE = fuse(OUT_OF_SCOPE_PATTERNS)
+_PROGRAMMING_RE = fuse(PROGRAMMING_PATTERNS)
+# Substring match like the original `k in q` scan, so "applying" still hits "apply"
+_SCOPE_KEYWORD_RE = re.compile("|".join(map(re.escape, COLLEGE_SCOPE_KEYWORDS)))
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+
 GREETING_KEYWORDS = ["hi", "hello", "hey", "greetings", "good morning", "good afternoon", "good evening"]
 
 OUT_OF_SCOPE_RESPONSE = "I am a college bot. I can only answer questions related to RVR&JC College administration, admissions, and campus life."
@@ -36,10 +47,25 @@ def is_greeting(query: str):
     """Check if the query is just a greeting."""
     q = query.strip().lower()
     # Remove punctuation
-    q = re.sub(r'[^\w\s]', '', q)
+    q = _PUNCT_RE.sub('', q)
     return q in GREETING_KEYWORDS
 
-def scope_check(query: str):
+
+def scope_check(query: str, strict: bool = False):
+    """
+    Decide whether a query belongs to the college domain.
+
+    With strict=True, queries that match no college keyword are rejected
+    instead of being passed on to the bots.
+
+    Returns:
+        (in_scope: bool, reason: str)
+    """
+    return _scope_check(cache_key(query), strict)
+
+
+@lru_cache(maxsize=4096)
+def _scope_check(query: str, strict: bool):
     q = query.strip().lower()
 
     # [OK] If query is a greeting, allow it (will be handled by main or bots)
@@ -47,21 +73,19 @@ def scope_check(query: str):
         return True, "greeting"
 
     # [FAIL] Out of scope patterns
-    for pat in OUT_OF_SCOPE_PATTERNS:
-        if re.search(pat, query):
-            return False, "out_of_scope"
+    if _OUT_OF_SCOPE_RE.search(q):
+        return False, "out_of_scope"
 
     # [FAIL] Programming patterns (unless explicitly about curriculum)
     # We might want to allow "python course" but block "write python code"
-    for pat in PROGRAMMING_PATTERNS:
-        if re.search(pat, query):
-             # Hard block if purely asking for code
-             if "code" in q or "program" in q:
-                 return False, "programming_out_of_scope"
+    if _PROGRAMMING_RE.search(q):
+        # Hard block if purely asking for code
+        if "code" in q or "program" in q:
+            return False, "programming_out_of_scope"
 
 
     # [OK] If query clearly college related
-    if any(k in q for k in COLLEGE_SCOPE_KEYWORDS):
+    if _SCOPE_KEYWORD_RE.search(q):
         return True, "college_scope"
 
     # [NEUTRAL] - If it's very short and not matched, it might be out of scope
@@ -69,23 +93,32 @@ def scope_check(query: str):
     # So if it doesn't match college keywords and is not a greeting, we should be strict?
     # But RAG queries might not contain keywords.
     # Let's keep it permissive but rely on Bot 3 to say "No Info" if it really doesn't know.
-    
+    if strict:
+        return False, "no_college_keywords"
+
     return True, "neutral_allow"
 
+def scope_check_batch(queries, strict: bool = False):
+    """Run scope_check over several queries. Returns one (in_scope, reason) per query."""
+    return [scope_check(q, strict) for q in queries]
+
 # ================= RAG Safety =================
 RAG_FORBIDDEN_PATTERNS = [
     r"(?i)\blocation|address|where is the college|map\b",
     r"(?i)\bphone|contact|number|email|call\b",
     r"(?i)\btiming|opening hours|working hours|office hours\b",
 ]
+_RAG_FORBIDDEN_RE = fuse(RAG_FORBIDDEN_PATTERNS)
 
 def is_rag_forbidden(query: str) -> bool:
     """
     Check if query touches topics forbidden for RAG (Location, Contact, Timings).
     These MUST be answered by Rule-Based Bot to prevent hallucinations.
     """
-    for pat in RAG_FORBIDDEN_PATTERNS:
-        if re.search(pat, query):
-            return True
-    return False
+    return _is_rag_forbidden(cache_key(query))
+
+
+@lru_cache(maxsize=4096)
+def _is_rag_forbidden(query: str) -> bool:
+    return _RAG_FORBIDDEN_RE.search(query.lower()) is not None
 
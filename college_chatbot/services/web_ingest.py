@@ -1,36 +1,78 @@
+import asyncio
 import os
-import requests
-from bs4 import BeautifulSoup
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+
+from core.http import create_async_client, create_session
+
+# One pooled keep-alive session per process
+_SESSION = create_session()
 
 def fetch_page_text(url: str) -> str:
-    headers = {"User-Agent": "Mozilla/5.0"}
-    r = requests.get(url, headers=headers, timeout=20)
+    r = _SESSION.get(url, timeout=20)
     r.raise_for_status()
 
-    soup = BeautifulSoup(r.text, "html.parser")
+    return _html_to_text(r.text)
+
+
+def _html_to_text(html: str) -> str:
+    tree = LexborHTMLParser(html)
 
     # remove noise
-    for tag in soup(["script", "style", "nav", "footer", "header"]):
-        tag.decompose()
+    for node in tree.css("script, style, nav, footer, header"):
+        node.decompose()
 
-    text = soup.get_text(separator="\n")
+    text = tree.root.text(separator="\n") if tree.root else ""
     lines = [ln.strip() for ln in text.splitlines()]
     lines = [ln for ln in lines if ln]
     return "\n".join(lines)
 
 
-def ingest_url(url: str, out_dir="data/bot3_docs/website"):
-    os.makedirs(out_dir, exist_ok=True)
-
+def _save_text(url: str, text: str, out_dir: str) -> str:
     safe_name = url.replace("https://", "").replace("http://", "")
     safe_name = safe_name.replace("/", "_").replace("?", "_").replace("&", "_")
 
     file_path = os.path.join(out_dir, f"{safe_name}.txt")
 
-    text = fetch_page_text(url)
-
     with open(file_path, "w", encoding="utf-8") as f:
         f.write(f"Source URL: {url}\n\n")
         f.write(text)
 
     return file_path
+
+
+def ingest_url(url: str, out_dir="data/bot3_docs/website"):
+    os.makedirs(out_dir, exist_ok=True)
+
+    text = fetch_page_text(url)
+
+    return _save_text(url, text, out_dir)
+
+
+# ================= Bulk async ingest =================
+def _parse_and_save(url: str, html: str, out_dir: str) -> str:
+    return _save_text(url, _html_to_text(html), out_dir)
+
+
+async def _ingest_one(client: httpx.AsyncClient, url: str, out_dir: str) -> str:
+    r = await client.get(url)
+    r.raise_for_status()
+
+    # Parsing and the file write run off the event loop so other fetches keep going
+    return await asyncio.to_thread(_parse_and_save, url, r.text, out_dir)
+
+
+async def ingest_urls(urls, out_dir="data/bot3_docs/website"):
+    """
+    Fetch and save many pages concurrently on one event loop.
+
+    Returns one entry per URL, in order: the saved file path, or the
+    exception that URL raised (one failing page doesn't cancel the rest).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    async with create_async_client(timeout=20) as client:
+        return await asyncio.gather(
+            *(_ingest_one(client, u, out_dir) for u in urls),
+            return_exceptions=True,
+        )
@@ -12,8 +12,10 @@ Run this script after:
 - Adding new documents to data/bot3_docs/
 """
 
+import mmap
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 print("="*70)
 print("[SETUP] RVRJCCE Chatbot - Index Setup Script")
@@ -28,13 +30,70 @@ import pickle
 import faiss
 import numpy as np
 import pandas as pd
+import torch
 from sentence_transformers import SentenceTransformer
 
+# Encoding (torch) and index building (FAISS/OpenMP) each get one thread per
+# physical core (os.cpu_count() counts hyperthreads). Without a common cap the
+# two pools size themselves differently and oversubscribe the CPU.
+NUM_THREADS = max(1, (os.cpu_count() or 2) // 2)
+torch.set_num_threads(NUM_THREADS)
+faiss.omp_set_num_threads(NUM_THREADS)
+
+# Texts per forward pass when encoding. Much larger than the
+# SentenceTransformers default (32) so each pass keeps the CPU/GPU busy.
+ENCODE_BATCH_SIZE = 256
+
+
+def encode_texts(texts):
+    """Encode all texts in one call; float32 unit vectors, like the query side."""
+    # No autograd bookkeeping: this script never trains
+    with torch.inference_mode():
+        return embed_model.encode(
+            texts,
+            batch_size=ENCODE_BATCH_SIZE,
+            show_progress_bar=True,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+
+
+# HNSW graph parameters. efSearch is saved inside the index file, so the bots
+# get it from faiss.read_index.
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+
+def build_index(vectors):
+    """
+    HNSW graph index over the vectors: sub-linear search instead of a full
+    scan per query. The vectors are unit length, so it ranks by inner product
+    (cosine), which needs only the dot product per candidate. The bots search
+    through core.vector_search.search_l2, which maps the similarities back to
+    squared L2, so their 1 / (1 + distance) scores and thresholds are unchanged.
+
+    Vectors are stored as float16 (768 B instead of 1536 B per 384-d vector),
+    halving the memory each search reads; scores move by well under 1e-3.
+    """
+    vectors = vectors.astype(np.float32)
+    index = faiss.IndexHNSWSQ(
+        vectors.shape[1], faiss.ScalarQuantizer.QT_fp16, HNSW_M, faiss.METRIC_INNER_PRODUCT
+    )
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    index.hnsw.efSearch = HNSW_EF_SEARCH
+    index.train(vectors)
+    index.add(vectors)
+    return index
+
+
 # Load embedding model ONCE
 print("\n[INIT] Loading shared embedding model...")
 try:
     embed_model = SentenceTransformer("all-MiniLM-L6-v2")
+    embed_model.eval()
     print("  [OK] Embedding model loaded: all-MiniLM-L6-v2")
+    print(f"  [OK] Threads: {NUM_THREADS} for torch and FAISS")
 except Exception as e:
     print(f"  [ERROR] Failed to load embedding model: {e}")
     sys.exit(1)
@@ -66,13 +125,12 @@ try:
     if all_questions:
         # Create embeddings
         print("  [WAIT] Creating embeddings...")
-        vectors = embed_model.encode(all_questions, show_progress_bar=True)
+        vectors = encode_texts(all_questions)
         print(f"  [OK] Embeddings created: shape {vectors.shape}")
         
         # Build FAISS index
         print("  [WAIT] Building FAISS index...")
-        index = faiss.IndexFlatL2(vectors.shape[1])
-        index.add(vectors.astype(np.float32))
+        index = build_index(vectors)
         print(f"  [OK] FAISS index built: {index.ntotal} vectors")
         
         # Save index and QA pairs
@@ -106,34 +164,54 @@ try:
     INDEX_DIR = "embeddings/bot3_faiss"
     CHUNK_SIZE = 500
     CHUNK_OVERLAP = 100
+    # Files read at once; reads release the GIL, so they overlap on disk
+    LOAD_WORKERS = 8
     
     # Chunk documents
     def chunk_document(text, source, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
-        chunks = []
-        start = 0
-        chunk_id = 0
-        
-        while start < len(text):
-            end = min(start + chunk_size, len(text))
-            chunk_text = text[start:end].strip()
-            
-            if chunk_text:
-                chunks.append({
-                    "text": chunk_text,
-                    "source": source,
-                    "chunk_id": chunk_id,
-                    "start_char": start,
-                    "end_char": end,
-                    "chunk_size": chunk_size
-                })
-                chunk_id += 1
-            
-            start = end - overlap
-            if start <= 0:
-                break
-        
-        return chunks
+        # All window offsets at once: windows step by (chunk_size - overlap) and
+        # stop after the first one that reaches the end of the text
+        n = len(text)
+        starts = np.arange(0, max(n - overlap, 1), chunk_size - overlap)
+        ends = np.minimum(starts + chunk_size, n)
+
+        windows = [
+            (start, end, text[start:end].strip())
+            for start, end in zip(starts.tolist(), ends.tolist())
+        ]
+        return [
+            {
+                "text": chunk_text,
+                "source": source,
+                "chunk_id": chunk_id,
+                "start_char": start,
+                "end_char": end,
+                "chunk_size": chunk_size
+            }
+            for chunk_id, (start, end, chunk_text) in enumerate(w for w in windows if w[2])
+        ]
     
+    # Read a text file through a read-only memory map: the UTF-8 decode runs
+    # straight off the mapped pages, with no intermediate read buffer
+    def read_document(filepath):
+        with open(filepath, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""  # mmap refuses empty files
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, "utf-8")
+        # Same newlines as text-mode open(), so chunk offsets don't change
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text.strip()
+
+    def load_document(filename):
+        """Read and chunk one file; errors are returned so one bad file doesn't stop the rest."""
+        try:
+            content = read_document(os.path.join(DATA_DIR, filename))
+            return chunk_document(content, filename) if content else None
+        except Exception as e:
+            return e
+
     # Load documents
     print("  [WAIT] Loading documents...")
     all_chunks = []
@@ -142,17 +220,16 @@ try:
         txt_files = sorted([f for f in os.listdir(DATA_DIR) if f.endswith(".txt")])
         print(f"     Found {len(txt_files)} text files")
         
-        for filename in txt_files:
-            filepath = os.path.join(DATA_DIR, filename)
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    content = f.read().strip()
-                    if content:
-                        chunks = chunk_document(content, filename)
-                        all_chunks.extend(chunks)
-                        print(f"     [OK] {filename}: {len(chunks)} chunks")
-            except Exception as e:
-                print(f"     [WARNING] Error loading {filename}: {e}")
+        # map() keeps file order, so chunk order and the index stay deterministic
+        with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as ex:
+            results = list(ex.map(load_document, txt_files))
+
+        for filename, chunks in zip(txt_files, results):
+            if isinstance(chunks, Exception):
+                print(f"     [WARNING] Error loading {filename}: {chunks}")
+            elif chunks is not None:
+                all_chunks.extend(chunks)
+                print(f"     [OK] {filename}: {len(chunks)} chunks")
     else:
         print(f"  [WARNING] Data directory not found: {DATA_DIR}")
     
@@ -162,14 +239,12 @@ try:
         # Create embeddings
         print("  [WAIT] Creating embeddings...")
         chunk_texts = [chunk["text"] for chunk in all_chunks]
-        embeddings = embed_model.encode(chunk_texts, show_progress_bar=True, convert_to_numpy=True)
+        embeddings = encode_texts(chunk_texts)
         print(f"  [OK] Embeddings created: shape {embeddings.shape}")
         
         # Build FAISS index
         print("  [WAIT] Building FAISS index...")
-        dimension = embeddings.shape[1]
-        index = faiss.IndexFlatL2(dimension)
-        index.add(embeddings.astype(np.float32))
+        index = build_index(embeddings)
         print(f"  [OK] FAISS index built: {index.ntotal} vectors")
         
         # Save index and metadata
@@ -9,9 +9,7 @@ print("Defaults:", StatsManager.get_top_queries())
 
 # 2. Increment
 print("Incrementing 'Test Query'...")
-StatsManager.increment_query_count("Test Query")
-StatsManager.increment_query_count("Test Query")
-StatsManager.increment_query_count("Another Query")
+StatsManager.increment_many(["Test Query", "Test Query", "Another Query"])
 
 # 3. Check stats
 top = StatsManager.get_top_queries(10)
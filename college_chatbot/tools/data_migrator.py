@@ -1,8 +1,15 @@
 
+import contextlib
+import hashlib
 import logging
+import multiprocessing
 import os
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import random
+import re
 
 # Configure Logger
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -10,6 +17,23 @@ logger = logging.getLogger("data_migrator")
 
 SOURCE_QA_FILE = "data/qa_dataset.csv"
 BASE_DOMAIN_DIR = "data/domains"
+QA_COLUMNS = ["question", "answer", "domain"]
+CHUNK_SIZE = 100_000  # source rows held in memory at a time
+# Stale source rows below which augmentation runs in-process: for small
+# inputs starting worker processes costs more than the work itself
+PARALLEL_MIN_ROWS = 20_000
+# Part of every domain's input hash: bump it when the augmentation output
+# changes, so qa.csv files written by the old code are regenerated
+AUGMENT_VERSION = "3"
+
+# Layout of each domain's qa.csv
+QA_SCHEMA = pa.schema([
+    ("question", pa.string()),
+    ("answer", pa.string()),
+    ("is_paraphrase", pa.bool_()),
+])
+# Fields the csv module (pandas' to_csv) quotes under QUOTE_MINIMAL
+_NEEDS_QUOTING = r'[",\r\n]'
 
 # Map full domain names to folder names
 DOMAIN_MAPPING = {
@@ -46,20 +70,159 @@ PARAPHRASE_TEMPLATES = [
     "Explain the {topic}."
 ]
 
+# Each template split once around its single {topic} placeholder, so a
+# paraphrase is prefix + topic + suffix with no format-string parsing
+_TEMPLATE_PARTS = [tmpl.split("{topic}") for tmpl in PARAPHRASE_TEMPLATES]
+_TEMPLATE_PREFIXES = np.array([prefix for prefix, _ in _TEMPLATE_PARTS], dtype=object)
+_TEMPLATE_SUFFIXES = np.array([suffix for _, suffix in _TEMPLATE_PARTS], dtype=object)
+# Per output column of the question matrix: original first, then one per template
+_IS_PARAPHRASE_COLUMN = np.arange(len(PARAPHRASE_TEMPLATES) + 1) > 0
+
+# Common question starts; the longest match wins ("what is the " over "what is ")
+QUESTION_STARTS = ["what is the ", "what is ", "how to ", "how do i ", "where is ", "is there ", "do you have ", "are there "]
+
+def _trie_pattern(words):
+    """
+    Regex matching any of words, factored into a prefix trie
+    ("what is (?:the )?|..."), so the engine walks each character once
+    instead of retrying every alternative. Prefers the longest word.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of a word
+
+    def render(node):
+        branches = [re.escape(ch) + render(child) for ch, child in node.items() if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        pattern = "(?:" + "|".join(branches) + ")"
+        return pattern + "?" if "" in node else pattern
+
+    return render(trie)
+
+_QUESTION_START_RE = re.compile("^" + _trie_pattern(QUESTION_STARTS))
+
 def extract_core_topic(question):
     """
     Very simple heuristic to extract 'topic' from question for templating.
     E.g. "What is the admission process?" -> "admission process"
     """
-    # Remove common starts
-    starts = ["what is the ", "what is ", "how to ", "how do i ", "where is ", "is there ", "do you have ", "are there "]
-    q_lower = question.lower().strip("?.,")
-    
-    for s in starts:
-        if q_lower.startswith(s):
-            return q_lower[len(s):]
-            
-    return q_lower
+    # Remove common starts: one anchored regex instead of a startswith() per prefix
+    return _QUESTION_START_RE.sub("", question.lower().strip("?.,"), count=1)
+
+def _domain_file(folder_name):
+    return os.path.join(BASE_DOMAIN_DIR, folder_name, "qa.csv")
+
+def _csv_field(column):
+    """String column as CSV fields, quoted only where _NEEDS_QUOTING matches."""
+    quoted = pc.binary_join_element_wise('"', pc.replace_substring(column, '"', '""'), '"', "")
+    return pc.if_else(pc.match_substring_regex(column, _NEEDS_QUOTING), quoted, column)
+
+def _write_csv_rows(f, batch):
+    """
+    Append batch to binary file f in pandas' to_csv format (minimal quoting,
+    True/False, os.linesep line ends), so qa.csv reads the same as before.
+    Rows are assembled by Arrow kernels and written as one buffer; Arrow's
+    own CSV writer quotes every string and writes true/false.
+    """
+    if batch.num_rows == 0:
+        return
+    flags = pc.if_else(batch.column("is_paraphrase"), "True" + os.linesep, "False" + os.linesep)
+    lines = pc.binary_join_element_wise(
+        _csv_field(batch.column("question")), _csv_field(batch.column("answer")), flags, ","
+    )
+    # Consecutive rows sit back to back in the array's data buffer
+    _, offsets_buf, data_buf = lines.buffers()
+    offsets = np.frombuffer(offsets_buf, dtype=np.int32, count=len(lines) + 1, offset=lines.offset * 4)
+    f.write(memoryview(data_buf)[offsets[0]:offsets[-1]])
+
+def _read_chunks():
+    """
+    qa_dataset.csv in CHUNK_SIZE-row frames, so memory is bounded by the
+    chunk size rather than the dataset. Only the columns used below are
+    parsed; usecols also fails fast if 'domain' etc. are missing. (The
+    pyarrow engine has no chunksize support, so this is the C parser.)
+    'domain' is categorical, so grouping hashes small integer codes.
+    """
+    return pd.read_csv(
+        SOURCE_QA_FILE,
+        usecols=QA_COLUMNS,
+        dtype={"question": "string[pyarrow]", "answer": "string[pyarrow]", "domain": "category"},
+        chunksize=CHUNK_SIZE,
+    )
+
+def _hash_domains():
+    """
+    Content hash and row count of each domain's input rows (values only,
+    not the index), accumulated chunk by chunk. Row hashes are per row, so
+    the digest is the same as hashing the whole domain at once.
+    """
+    hashers, sizes = {}, {}
+    for chunk in _read_chunks():
+        for domain_name, group in chunk.groupby("domain", sort=False, observed=True):
+            if domain_name not in hashers:
+                hashers[domain_name] = hashlib.md5(AUGMENT_VERSION.encode())
+                sizes[domain_name] = 0
+            rows = pd.util.hash_pandas_object(group[["question", "answer"]], index=False)
+            hashers[domain_name].update(rows.values.tobytes())
+            sizes[domain_name] += len(group)
+    return {domain_name: (h.hexdigest(), sizes[domain_name]) for domain_name, h in hashers.items()}
+
+def _is_up_to_date(target_file, input_hash):
+    """True if target_file was last written from input with this hash"""
+    if not os.path.exists(target_file):
+        return False
+    try:
+        with open(target_file + ".sha", encoding="utf-8") as f:
+            return f.read().strip() == input_hash
+    except OSError:
+        return False
+
+def _augment_batch(item):
+    """
+    Augment one chunk of a domain's Q&A rows, without duplicate
+    (question, answer) pairs. May run in a worker process; returns
+    (folder_name, pyarrow.RecordBatch).
+    """
+    folder_name, group = item
+
+    # Row-major (question x [original] + templates) matrix, built with
+    # broadcasting instead of a per-row, per-template Python loop
+    questions = group["question"].to_numpy(dtype=object, na_value="")
+    answers = group["answer"].to_numpy(dtype=object, na_value="")
+    topics = np.vectorize(extract_core_topic, otypes=[object])(questions)
+
+    paraphrases = _TEMPLATE_PREFIXES[None, :] + topics[:, None] + _TEMPLATE_SUFFIXES[None, :]
+
+    all_questions = np.column_stack([questions, paraphrases])
+    all_answers = np.broadcast_to(answers[:, None], all_questions.shape)
+    # is_paraphrase depends only on the column (0 = original), so it is one
+    # row of flags broadcast as a view rather than a full bool matrix
+    is_paraphrase = np.broadcast_to(_IS_PARAPHRASE_COLUMN, all_questions.shape)
+
+    # Keep the first occurrence of each (question, answer) pair, in row-major
+    # order. That drops paraphrases identical to their own original as well
+    # as ones another row or template already produced. Originals are only
+    # dropped if they repeat an earlier pair exactly, so no answer is lost.
+    # duplicated() compares the values themselves, not hashes of them.
+    keep = np.flatnonzero(~pd.DataFrame({
+        "question": all_questions.ravel(),
+        "answer": all_answers.ravel(),
+    }, copy=False).duplicated(keep="first").to_numpy())
+
+    # Typed Arrow columns, formatted by _write_csv_rows without any
+    # per-cell Python calls
+    batch = pa.RecordBatch.from_arrays([
+        pa.array(all_questions.ravel()[keep], type=pa.string()),
+        pa.array(all_answers.ravel()[keep], type=pa.string()),
+        pa.array(is_paraphrase.ravel()[keep]),
+    ], schema=QA_SCHEMA)
+    return folder_name, batch
 
 def migrate_and_augment():
     logger.info("Starting Data Migration and Augmentation...")
@@ -69,45 +232,75 @@ def migrate_and_augment():
         return
 
     try:
-        df = pd.read_csv(SOURCE_QA_FILE)
-        
-        # Ensure 'domain' and existing columns
-        if "domain" not in df.columns:
-            logger.error("No domain column found in QA dataset.")
-            return
-
-        for domain_name, group in df.groupby("domain"):
+        # Pass 1: hash every domain and keep only those whose inputs changed
+        # since the last run; for the rest the existing qa.csv is current
+        domains = _hash_domains()
+        stale, stale_rows = {}, 0
+        for domain_name, (input_hash, n_rows) in sorted(domains.items()):
             folder_name = DOMAIN_MAPPING.get(domain_name)
             if not folder_name:
                 logger.warning(f"Unknown domain '{domain_name}', skipping...")
                 continue
-                
-            target_file = os.path.join(BASE_DOMAIN_DIR, folder_name, "qa.csv")
+            if _is_up_to_date(_domain_file(folder_name), input_hash):
+                logger.info(f"'{domain_name}' unchanged, keeping {_domain_file(folder_name)}")
+                continue
+            stale[folder_name] = input_hash
+            stale_rows += n_rows
+
+        if not stale:
+            return
+
+        # Pass 2: stream the stale domains' rows through the workers and
+        # append the results to per-domain writers, one chunk at a time.
+        # The old hash goes first and the new one is written last, so an
+        # interrupted write is redone on the next run.
+        # Cross-chunk dedup is only needed when the source spans several chunks
+        multi_chunk = sum(n_rows for _, n_rows in domains.values()) > CHUNK_SIZE
+        writers, counts, seen = {}, {}, {}
+        for folder_name in stale:
+            target_file = _domain_file(folder_name)
             os.makedirs(os.path.dirname(target_file), exist_ok=True)
-            
-            new_rows = []
-            
-            for _, row in group.iterrows():
-                question = row["question"]
-                answer = row["answer"]
-                
-                # Add original
-                new_rows.append({"question": question, "answer": answer, "is_paraphrase": False})
-                
-                # Generate Paraphrases
-                # 1. Extract topic
-                topic = extract_core_topic(question)
-                
-                # 2. Apply templates
-                for tmpl in PARAPHRASE_TEMPLATES:
-                    para_q = tmpl.format(topic=topic)
-                    if para_q != question:
-                        new_rows.append({"question": para_q, "answer": answer, "is_paraphrase": True})
-            
-            # Save to domain file
-            domain_df = pd.DataFrame(new_rows)
-            domain_df.to_csv(target_file, index=False)
-            logger.info(f"Saved {len(domain_df)} entries to {target_file}")
+            if os.path.exists(target_file + ".sha"):
+                os.remove(target_file + ".sha")
+            writers[folder_name] = open(target_file, "wb")
+            writers[folder_name].write((",".join(QA_SCHEMA.names) + os.linesep).encode("utf-8"))
+            counts[folder_name] = 0
+            seen[folder_name] = set()  # (question, answer) pairs written so far
+
+        # Domains run in parallel, so a pool only pays off with several
+        # stale domains and enough rows to amortize starting the workers
+        workers = min(len(stale), os.cpu_count() or 1)
+        use_pool = workers > 1 and stale_rows >= PARALLEL_MIN_ROWS
+        try:
+            with (multiprocessing.Pool(workers) if use_pool else contextlib.nullcontext()) as pool:
+                run = pool.imap if use_pool else map
+                for chunk in _read_chunks():
+                    work = []
+                    for domain_name, group in chunk.groupby("domain", sort=False, observed=True):
+                        folder_name = DOMAIN_MAPPING.get(domain_name)
+                        if folder_name in stale:
+                            work.append((folder_name, group[["question", "answer"]]))  # only what workers need
+                    # imap/map keep chunk order, so each file keeps the source row order
+                    for folder_name, batch in run(_augment_batch, work):
+                        # Batches are deduped within a chunk; drop pairs an earlier chunk wrote
+                        if multi_chunk:
+                            pairs = list(zip(batch.column("question").to_pylist(), batch.column("answer").to_pylist()))
+                            written = seen[folder_name]
+                            new = np.fromiter((pair not in written for pair in pairs), dtype=bool, count=len(pairs))
+                            if not new.all():
+                                batch = batch.filter(pa.array(new))
+                            written.update(pairs)
+                        _write_csv_rows(writers[folder_name], batch)
+                        counts[folder_name] += batch.num_rows
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        for folder_name, input_hash in stale.items():
+            target_file = _domain_file(folder_name)
+            with open(target_file + ".sha", "w", encoding="utf-8") as f:
+                f.write(input_hash)
+            logger.info(f"Saved {counts[folder_name]} entries to {target_file}")
 
     except Exception as e:
         logger.error(f"Migration failed: {e}")
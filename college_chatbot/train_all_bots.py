@@ -1,8 +1,11 @@
 
+import argparse
 import os
 import sys
 import subprocess
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Ensure project root is in path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -11,6 +14,9 @@ from core.logger import get_logger
 
 logger = get_logger("train_all_bots")
 
+# Child output lines kept for the failure report; everything else is only logged
+TAIL_LINES = 50
+
 def run_step(description, command):
     logger.info(f"[{description}] Starting...")
     print(f"\n>>> {description}...")
@@ -20,44 +26,71 @@ def run_step(description, command):
         # Use sys.executable to ensure we use the same python environment
         cmd_list = [sys.executable] + command.split() if command.startswith("scripts") or command.endswith(".py") else command.split()
         
-        result = subprocess.run(cmd_list, capture_output=True, text=True)
+        # Stream the child's output into the log as it runs instead of buffering
+        # all of it; only the last TAIL_LINES are kept for the failure report
+        tail = deque(maxlen=TAIL_LINES)
+        with subprocess.Popen(
+            cmd_list, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+        ) as proc:
+            for line in proc.stdout:
+                line = line.rstrip()
+                tail.append(line)
+                logger.info(f"[{description}] {line}")
+            returncode = proc.wait()
         
-        if result.returncode == 0:
+        if returncode == 0:
             logger.info(f"[{description}] SUCCESS ({time.time() - start_time:.2f}s)")
-            print(f"    [OK] Completed in {time.time() - start_time:.2f}s")
+            print(f"    [OK] {description}: completed in {time.time() - start_time:.2f}s")
             return True
         else:
-            logger.error(f"[{description}] FAILED")
-            logger.error(result.stderr)
-            print(f"    [FAIL] Error:\n{result.stderr}")
+            output = "\n".join(tail)
+            logger.error(f"[{description}] FAILED (exit code {returncode})")
+            logger.error(output)
+            print(f"    [FAIL] {description}:\n{output}")
             return False
     except Exception as e:
         logger.error(f"[{description}] EXCEPTION: {e}")
-        print(f"    [ERROR] {e}")
+        print(f"    [ERROR] {description}: {e}")
         return False
 
-def main():
-    print("="*60)
-    print("🤖  COLLEGE CHATBOT - FULL RETRAINING SUITE")
-    print("="*60)
-    
+# --only choice -> (description, command)
+STEPS = {
     # 1. Train Classifier
-    step1 = run_step("Training Intent Classifier", "classifier/train_classifier.py")
-    
+    "classifier": ("Training Intent Classifier", "classifier/train_classifier.py"),
     # 2. Rebuild Bot-2 Indices (Semantic QA)
     # We can use the script we created earlier
-    step2 = run_step("Rebuilding Bot-2 (Semantic) Indices", "scripts/rebuild_bot2.py")
-    
+    "bot2": ("Rebuilding Bot-2 (Semantic) Indices", "scripts/rebuild_bot2.py"),
     # 3. Rebuild Bot-3 Index (RAG Documents)
     # We should use build_bot3_index.py as it seems more robust/recent than rebuild_rag.py
-    step3 = run_step("Rebuilding Bot-3 (RAG) Index", "build_bot3_index.py")
+    "bot3": ("Rebuilding Bot-3 (RAG) Index", "build_bot3_index.py"),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrain the classifier and rebuild the bot indices.")
+    parser.add_argument(
+        "--only", nargs="+", choices=[*STEPS, "all"], default=["all"],
+        help="Run only these steps, e.g. --only bot2 bot3 (default: all)",
+    )
+    args = parser.parse_args()
+
+    print("="*60)
+    print("🤖  COLLEGE CHATBOT - FULL RETRAINING SUITE")
+    print("="*60)
+    
+    steps = [step for name, step in STEPS.items() if "all" in args.only or name in args.only]
+
+    # The three builds read and write disjoint data, so they run side by side:
+    # wall time is the slowest step instead of the sum. Threads are enough, each
+    # one just waits on its child process.
+    with ThreadPoolExecutor(max_workers=len(steps)) as ex:
+        results = list(ex.map(lambda step: run_step(*step), steps))
     
     # 4. Bot-1 (AIML)
     print("\n>>> Reloading Bot-1 (Rule-based)...")
     print("    [INFO] AIML files are loaded dynamically on restart. No build step required.")
     
     print("\n" + "="*60)
-    if step1 and step2 and step3:
+    if all(results):
         print("✅  ALL SYSTEMS RETRAINED SUCCESSFULLY!")
         print("    Please restart the application server to apply changes.")
     else:
@@ -4,11 +4,14 @@ import os
 
 print("--- Data Verification ---")
 try:
-    df = pd.read_csv("data/classifier_data.csv")
-    print(f"Dataset Shape: {df.shape}")
-    print(f"Columns: {df.columns.tolist()}")
+    # Header only first, then just the category column as a categorical, so
+    # value_counts() counts small integer codes instead of Python strings
+    columns = pd.read_csv("data/classifier_data.csv", nrows=0).columns.tolist()
+    col = "category" if "category" in columns else "Category"
+    df = pd.read_csv("data/classifier_data.csv", usecols=[col], dtype={col: "category"}, engine="pyarrow")
+    print(f"Dataset Shape: {(len(df), len(columns))}")
+    print(f"Columns: {columns}")
     
-    col = "category" if "category" in df.columns else "Category"
     print("\nCategory Distribution:")
     print(df[col].value_counts())
 except Exception as e:
@@ -18,7 +21,15 @@ print("\n--- Model Verification ---")
 if os.path.exists("classifier/classifier.pkl"):
     print("classifier.pkl exists.")
     try:
-        model = joblib.load("classifier/classifier.pkl")
+        # mmap_mode maps the model's NumPy arrays read-only instead of copying
+        # them into RAM; this only checks the model loads, so that is enough.
+        # Pickles joblib cannot memory-map are loaded normally.
+        try:
+            model = joblib.load("classifier/classifier.pkl", mmap_mode="r")
+        except ValueError:
+            model = joblib.load("classifier/classifier.pkl")
+        if not hasattr(model, "predict"):
+            raise TypeError(f"loaded object is a {type(model).__name__}, not a classifier")
         print("Model loaded successfully.")
     except Exception as e:
         print(f"Error loading model: {e}")